@@ -1,27 +1,194 @@
+import hashlib
 import shutil
-import requests
 import subprocess
+from functools import cached_property
+from importlib import import_module
 from os import path
+from threading import Event, Lock
+from time import monotonic
+from uuid import uuid4
 
 __all__ = ['RescaleAPI']
 
 
+DEFAULT_CACHE_TTL = 5.0 # seconds
+CHUNK_SIZE = 131072 # 128KB
+
+
+class _LazyModule:
+    def __init__(self, name: str):
+        self.name = name
+        self.module = None
+
+    def __getattr__(self, attr):
+        if self.module is None:
+            self.module = import_module(self.name)
+        return getattr(self.module, attr)
+
+
+# Imported on the first request to keep application start-up fast
+requests = _LazyModule('requests')
+
+
+class _InFlight:
+    def __init__(self):
+        self.event = Event()
+        self.value = None
+        self.error = None
+
+
+# Returns (algorithm, hex digest) of the first checksum in file metadata that hashlib supports
+def expected_checksum(checksums):
+    for checksum in checksums or ():
+        algorithm = checksum.get('hashFunction', '').lower().replace('-', '')
+        if algorithm in hashlib.algorithms_available and checksum.get('fileHash'):
+            return algorithm, checksum['fileHash'].lower()
+    return None, None
+
+
+class _MultipartReader:
+    def __init__(self, file_name: str, progress=None, digest=None):
+        boundary = uuid4().hex
+        self.content_type = f'multipart/form-data; boundary={boundary}'
+        self.parts = [(f'--{boundary}\r\nContent-Disposition: form-data; name="file"; '
+                       f'filename="{path.basename(file_name)}"\r\n'
+                       'Content-Type: application/octet-stream\r\n\r\n').encode('utf-8'),
+                      open(file_name, 'rb'),
+                      f'\r\n--{boundary}--\r\n'.encode('utf-8')]
+        self.length = len(self.parts[0]) + path.getsize(file_name) + len(self.parts[2])
+        self.progress = progress
+        self.digest = digest
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        while chunk := self.read(CHUNK_SIZE):
+            yield chunk
+
+    def read(self, size: int = -1):
+        while self.parts:
+            part = self.parts[0]
+            if isinstance(part, bytes):
+                self.parts.pop(0)
+                return part
+
+            chunk = part.read(size if size and size > 0 else CHUNK_SIZE)
+            if chunk:
+                if self.digest:
+                    self.digest.update(chunk)
+                if self.progress:
+                    self.progress(len(chunk))
+                return chunk
+            part.close()
+            self.parts.pop(0)
+        return b''
+
+    def close(self):
+        for part in self.parts:
+            if not isinstance(part, bytes):
+                part.close()
+        self.parts = []
+
+
 class RescaleAPI:
-    def __init__(self, api_base_url: str, api_token: str):
+    def __init__(self, api_base_url: str, api_token: str, cache_ttl: float = DEFAULT_CACHE_TTL):
         self.api_base_url = api_base_url
         self.api_token = api_token
         self.headers = {'Authorization': f'Token {api_token}'}
-        self.has_cli = True if shutil.which('rescale-cli') else False
+
+        self.cache_ttl = cache_ttl
+        self.cache_lock = Lock()
+        self.cache = {}
+        self.cache_pruned = monotonic()
+        self.in_flight = {}
+        self.cache_generation = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_coalesced = 0
+
+
+    @cached_property
+    def has_cli(self):
+        return True if shutil.which('rescale-cli') else False
+
+
+    #########
+    # Cache #
+    def cached_get(self, url: str):
+        leader = False
+        with self.cache_lock:
+            entry = self.cache.get(url)
+            if entry and entry[0] > monotonic():
+                self.cache_hits += 1
+                return entry[1]
+
+            flight = self.in_flight.get(url)
+            if flight:
+                self.cache_coalesced += 1
+            else:
+                self.cache_misses += 1
+                flight = self.in_flight[url] = _InFlight()
+                generation = self.cache_generation
+                leader = True
+
+        if not leader:
+            flight.event.wait()
+            if flight.error:
+                raise flight.error
+            return flight.value
+
+        try:
+            response = requests.get(url, headers=self.headers)
+            response.raise_for_status()
+            flight.value = response.json()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.cache_lock:
+                del self.in_flight[url]
+                # Skip storing if invalidated while the request was in flight
+                if flight.error is None and generation == self.cache_generation and self.cache_ttl > 0:
+                    self.prune_cache()
+                    self.cache[url] = (monotonic() + self.cache_ttl, flight.value)
+            flight.event.set()
+
+        return flight.value
+
+
+    # Drops expired entries at most once per TTL so per-job/run URLs don't pile up (caller holds cache_lock)
+    def prune_cache(self):
+        now = monotonic()
+        if now - self.cache_pruned < self.cache_ttl:
+            return
+        for url in [url for url, entry in self.cache.items() if entry[0] <= now]:
+            del self.cache[url]
+        self.cache_pruned = now
+
+
+    def invalidate_job(self, job_id: str):
+        with self.cache_lock:
+            key = f'/api/v2/jobs/{job_id}/'
+            for url in tuple(self.cache):
+                if key in url:
+                    del self.cache[url]
+            self.cache_generation += 1
+
+
+    def cache_stats(self):
+        with self.cache_lock:
+            return {'hits': self.cache_hits, 'misses': self.cache_misses,
+                    'coalesced': self.cache_coalesced, 'entries': len(self.cache)}
+    #########
+    # Cache #
 
 
     ########
     # Runs #
     def get_run_status(self, job_id: str, run_idx: int = 1):
         url = f'{self.api_base_url}/api/v2/jobs/{job_id}/runs/{run_idx}/'
-        response = requests.get(url, headers=self.headers)
-        response.raise_for_status()
-
-        return response.json()
+        return self.cached_get(url)
 
 
     def is_run_started(self, job_id: str, runs: int = 1):
@@ -38,6 +205,22 @@ class RescaleAPI:
         if status:
             if 'dateStarted' in status.keys():
                 return status['dateCompleted'] != None
+
+
+    def list_run_files(self, job_id: str, run_idx: int = 1):
+        url = f'{self.api_base_url}/api/v2/jobs/{job_id}/runs/{run_idx}/directory-contents/'
+        return self.cached_get(url)
+
+
+    def get_run_file_bytes(self, job_id: str, file_path: str, offset: int = 0, run_idx: int = 1):
+        url = f'{self.api_base_url}/api/v2/jobs/{job_id}/runs/{run_idx}/files/contents/'
+        headers = dict(self.headers, Range=f'bytes={offset}-')
+        response = requests.get(url, headers=headers, params={'path': file_path})
+        if response.status_code == 416: # Nothing new since offset
+            return b''
+        response.raise_for_status()
+
+        return response.content if response.status_code == 206 else response.content[offset:] # Range ignored
     ########
     # Runs #
 
@@ -55,6 +238,7 @@ class RescaleAPI:
     def submit_job(self, job_id: str):
         url = f'{self.api_base_url}/api/v2/jobs/{job_id}/submit/'
         response = requests.post(url, headers=self.headers)
+        self.invalidate_job(job_id)
         response.raise_for_status()
 
         return bool(response)
@@ -62,23 +246,31 @@ class RescaleAPI:
 
     def get_job_statuses(self, job_id: str):
         url = f'{self.api_base_url}/api/v2/jobs/{job_id}/statuses/'
-        response = requests.get(url, headers=self.headers)
-        response.raise_for_status()
-
-        return response.json()
+        return self.cached_get(url)
 
 
     def is_job_started(self, job_id: str):
         statuses = self.get_job_statuses(job_id)
 
+        results = 0
         if statuses:
             results = sum(map(lambda result: result['status'] == 'Started', statuses['results']))
         return bool(results)
 
 
+    def is_job_executing(self, job_id: str):
+        statuses = self.get_job_statuses(job_id)
+
+        results = 0
+        if statuses:
+            results = sum(map(lambda result: result['status'] == 'Executing', statuses['results']))
+        return bool(results)
+
+
     def is_job_completed(self, job_id: str):
         statuses = self.get_job_statuses(job_id)
 
+        results = 0
         if statuses:
             results = sum(map(lambda result: result['status'] == 'Completed', statuses['results']))
         return bool(results)
@@ -88,6 +280,7 @@ class RescaleAPI:
         if len(self.get_job_statuses(job_id)['results']):
             url = f'{self.api_base_url}/api/v2/organizations/{organization_code}/job-prioritization/'
             response = requests.post(url, headers=self.headers, json={'job': job_id, 'priority': priority})
+            self.invalidate_job(job_id)
             response.raise_for_status()
 
             return response.json()['priority'] == priority
@@ -96,6 +289,7 @@ class RescaleAPI:
     def assign_project(self, organization_code: str, job_id: str, project_id: str):
         url = f'{self.api_base_url}/api/v2/organizations/{organization_code}/jobs/{job_id}/project-assignment/'
         response = requests.post(url, headers=self.headers, json={'projectId': f'{project_id}'})
+        self.invalidate_job(job_id)
         response.raise_for_status()
 
         if project_id in response.text:
@@ -113,19 +307,31 @@ class RescaleAPI:
             response = requests.get(url, headers=self.headers)
             response.raise_for_status()
 
-            ret.extend(response.json()['results'])
-            url = response['next']
+            page = response.json()
+            ret.extend(page['results'])
+            url = page['next']
 
-        if len(ret) == response['count']:
+        if len(ret) == page['count']:
             return ret
 
 
+    def get_file_info(self, file_id: str):
+        url = f'{self.api_base_url}/api/v2/files/{file_id}/'
+        response = requests.get(url, headers=self.headers)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+
+        return response.json()
+
+
     def upload_files(self, file_names: list[str], get_file_id: bool = True):
         if self.has_cli:
             return self.cli_base_upload(file_names, get_file_id)
         else:
             ret = tuple(self.api_base_upload(file_name, get_file_id) for file_name in file_names)
-            return ret if get_file_id else len(ret) == len(file_names)
+            if all(ret):
+                return ret if get_file_id else True
 
 
     def upload_file(self, file_name: str, get_file_id: bool = True):
@@ -135,11 +341,11 @@ class RescaleAPI:
             return self.api_base_upload(file_name, get_file_id)
 
 
-    def download_file(self, file_id: int, download_path: str, file_name: str, download_size: int):
+    def download_file(self, file_id: int, download_path: str, file_name: str, download_size: int, checksums=None):
         if self.has_cli and download_size > 134217728: # 128MB
             return self.cli_base_download(file_id, download_path, file_name, download_size)
         else:
-            return self.api_base_download(file_id, download_path, file_name, download_size)
+            return self.api_base_download(file_id, download_path, file_name, download_size, checksums=checksums)
 
 
     def cli_base_download(self, file_id: int, download_path: str, file_name: str, download_size: int):
@@ -164,26 +370,59 @@ class RescaleAPI:
             return True
 
 
-    def api_base_download(self, file_id: int, download_path: str, file_name: str, download_size: int):
-        url = f'{self.api_base_url}/api/v2/files/{file_id}/contents/'
-        response = requests.get(url, headers=self.headers)
-        response.raise_for_status()
+    def api_base_download(self, file_id: int, download_path: str, file_name: str, download_size: int,
+                          offset: int = 0, progress=None, checksums=None, digest=None):
+        algorithm, expected = expected_checksum(checksums)
+        if digest is None and algorithm:
+            digest = hashlib.new(algorithm)
 
+        url = f'{self.api_base_url}/api/v2/files/{file_id}/contents/'
+        headers = dict(self.headers, Range=f'bytes={offset}-') if offset else self.headers
         download_dest = path.join(download_path, file_name)
-        with open(download_dest, 'wb') as fd:
-            for chunk in response.iter_content(131072): # 128KB
-                fd.write(chunk)
-        if path.exists(download_dest) and path.getsize(download_dest) == download_size:
-            return True
-
+        with requests.get(url, headers=headers, stream=True) as response:
+            response.raise_for_status()
 
-    def api_base_upload(self, file_name: str, get_file_id: bool = True):
+            if offset and response.status_code != 206: # Range ignored, start over
+                offset = 0
+            if offset and digest: # Resumed download, hash the part already on disk
+                with open(download_dest, 'rb') as fd:
+                    while chunk := fd.read(CHUNK_SIZE):
+                        digest.update(chunk)
+            with open(download_dest, 'ab' if offset else 'wb') as fd:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    fd.write(chunk)
+                    if digest:
+                        digest.update(chunk)
+                    if progress:
+                        progress(len(chunk))
+
+        if not (path.exists(download_dest) and path.getsize(download_dest) == download_size):
+            return
+        if expected and digest.name == algorithm and digest.hexdigest() != expected:
+            return
+        return True
+
+
+    # 업로드 중 계산한 해시와 크기를 응답의 fileChecksums, decryptedSize와 비교 (불일치 시 None)
+    def api_base_upload(self, file_name: str, get_file_id: bool = True, progress=None, digest=None):
+        digest = digest or hashlib.sha512()
         url = f'{self.api_base_url}/api/v2/files/contents/'
-        response = requests.post(url, files={'file': open(file_name, 'rb')}, headers=self.headers)
+        reader = _MultipartReader(file_name, progress, digest)
+        try:
+            response = requests.post(url, data=reader, headers=dict(self.headers, **{'Content-Type': reader.content_type}))
+        finally:
+            reader.close()
         response.raise_for_status()
 
+        uploaded = response.json()
+        if 'decryptedSize' in uploaded and int(uploaded['decryptedSize']) != path.getsize(file_name):
+            return
+        algorithm, expected = expected_checksum(uploaded.get('fileChecksums'))
+        if expected and digest.name == algorithm and digest.hexdigest() != expected:
+            return
+
         if get_file_id:
-            return response.json()['id']
+            return uploaded['id']
         else:
             return True
     #########
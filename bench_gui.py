@@ -0,0 +1,157 @@
+import json
+import os
+import posixpath
+import shutil
+import sys
+import tempfile
+import time
+from os import path
+
+# GUI 데이터 처리 경로 규모 벤치마크 (화면 없이 offscreen Qt 사용)
+#   python bench_gui.py                              100, 1k, 10k 디렉토리 측정 후 기준값과 비교
+#   python bench_gui.py --scales 100,1000            측정 규모 지정
+#   python bench_gui.py --update-baseline            현재 측정값을 기준값으로 저장
+#   기준값(gui_baseline.json)은 측정한 장비에 따라 다르므로 장비가 바뀌면 --update-baseline으로 다시 기록
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+BENCH_DIR = path.dirname(path.abspath(__file__))
+BASELINE_FILE = path.join(BENCH_DIR, "gui_baseline.json")
+DEFAULT_SCALES = (100, 1000, 10000)
+TOLERANCE = 1.5 # 기준값 대비 허용 배율
+LOG_MESSAGES = 2000
+MACRO_NAME = "run.java"
+# 제출 전 사전 점검(dry_run.REQUIRED_CONFIG_KEYS)을 통과하도록 값 지정
+BENCH_CONFIG = {'apibaseurl': 'http://127.0.0.1', 'apikey': '', 'software': 'starccm_plus',
+                'license_server': '1999@127.0.0.1', 'project_code': 'BENCH'}
+
+
+# 프로그램은 Windows 경로('dir\\file.sim')를 사용하므로 다른 OS에서는 구분자를 변환
+class _PathShim:
+    def __getattr__(self, attr):
+        return getattr(posixpath, attr)
+
+    def join(self, *paths):
+        return posixpath.join(*(p.replace('\\', '/') for p in paths))
+
+
+# 디렉토리마다 .sim 1개와 .java 1개를 가진 가상 프로젝트 생성
+def create_tree(root, count):
+    for i in range(count):
+        case_dir = path.join(root, f"case_{i:05d}")
+        os.makedirs(case_dir)
+        with open(path.join(case_dir, f"case_{i:05d}.sim"), 'wb') as fd:
+            fd.write(b'\0' * 1024)
+        with open(path.join(case_dir, MACRO_NAME), 'w', encoding='utf-8') as fd:
+            fd.write('// macro\n')
+
+
+def elapsed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def measure(gui, root):
+    import gui_program
+
+    results = {}
+    results['scan'] = elapsed(gui.update_file_list_widgets, root)
+
+    # 디렉토리 하나를 다시 선택할 때의 지연 시간
+    item = gui.dir_list_widget.item(0)
+    item.setSelected(False)
+    results['click'] = elapsed(item.setSelected, True)
+
+    # .java 일괄 선택 후 검증 및 제출 목록 생성
+    gui.java_combo_box.setCurrentText(MACRO_NAME)
+
+    warnings = []
+    gui_program.QMessageBox.warning = lambda *args: warnings.append(args[-1])
+    results['validate'] = elapsed(gui.validate_inputs)
+    if warnings:
+        raise RuntimeError(f"Validation failed: {warnings[0]}")
+
+    enqueued = []
+    gui.scheduler.enqueue = lambda worker, *args, **kwargs: enqueued.append(worker)
+    results['submit'] = elapsed(gui.submit_job)
+    if len(enqueued) != gui.dir_list_widget.count():
+        raise RuntimeError(f"Submitted {len(enqueued)} of {gui.dir_list_widget.count()} directories")
+
+    messages = [f"Downloading {i}" if i % 2 else f"Log message {i}" for i in range(LOG_MESSAGES)]
+    start = time.perf_counter()
+    for message in messages:
+        gui.update_log(message)
+    results['log_per_sec'] = LOG_MESSAGES / (time.perf_counter() - start)
+    return results
+
+
+def run(scales):
+    from PyQt6.QtWidgets import QApplication
+    import gui_program
+
+    if os.name != 'nt':
+        gui_program.path = _PathShim()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    cwd = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix='autopilot_bench_')
+    ret = {}
+    try:
+        os.chdir(work_dir)
+        with open(gui_program.CONFIG_FILE, 'w', encoding='utf-8') as f:
+            json.dump(BENCH_CONFIG, f)
+
+        for scale in scales:
+            root = path.join(work_dir, f"tree_{scale}")
+            create_tree(root, scale)
+            gui = gui_program.GUIProgram()
+            sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+            ret[str(scale)] = measure(gui, root)
+            gui.deleteLater()
+            app.processEvents()
+            print(f"{scale:>6} dirs: " + ', '.join(f"{k} {v:.4f}" for k, v in ret[str(scale)].items()))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return ret
+
+
+# 기준값 대비 느려진 항목 목록 (log_per_sec는 클수록 좋음)
+def compare(results, baseline):
+    regressions = []
+    for scale, metrics in results.items():
+        for name, value in metrics.items():
+            base = baseline.get(scale, {}).get(name)
+            if base is None:
+                continue
+            if (value < base / TOLERANCE) if name == 'log_per_sec' else (value > base * TOLERANCE):
+                regressions.append(f"{scale} dirs {name}: {base:.4f} -> {value:.4f}")
+    return regressions
+
+
+def main():
+    scales = DEFAULT_SCALES
+    if '--scales' in sys.argv:
+        scales = tuple(int(s) for s in sys.argv[sys.argv.index('--scales') + 1].split(','))
+
+    results = run(scales)
+    if '--update-baseline' in sys.argv:
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=4)
+        print(f"Baseline saved: {BASELINE_FILE}")
+        return 0
+
+    if not path.exists(BASELINE_FILE):
+        print(f"FAIL: no baseline found ({BASELINE_FILE}). Run with --update-baseline to record one.")
+        return 1
+
+    with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+        regressions = compare(results, json.load(f))
+    for regression in regressions:
+        print(f"FAIL: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
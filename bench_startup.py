@@ -0,0 +1,68 @@
+import json
+import subprocess
+import sys
+from os import path
+
+# 시작 시간 회귀 검사: gui_program import 시간 측정 및 지연 import 대상 모듈 확인
+#   python bench_startup.py                   기준값과 비교
+#   python bench_startup.py --update-baseline 현재 측정값을 기준값으로 저장
+#   기준값(startup_baseline.json)은 측정한 장비에 따라 다르므로 장비가 바뀌면 --update-baseline으로 다시 기록
+
+BASELINE_FILE = path.join(path.dirname(path.abspath(__file__)), "startup_baseline.json")
+TOLERANCE = 1.25 # 기준값 대비 허용 배율
+REPEAT = 5
+
+# 시작 시 import 되면 안 되는 모듈 (처음 사용할 때 import)
+DEFERRED_MODULES = ('requests', 'http.server', 'config_dialog', 'packing', 'notifications', 'license_gate',
+                    'csv')
+
+
+def measure_import_time():
+    command = [sys.executable, '-X', 'importtime', '-c', 'import gui_program']
+    completed_proc = subprocess.run(command, capture_output=True, text=True, cwd=path.dirname(BASELINE_FILE))
+    completed_proc.check_returncode()
+
+    # 형식: "import time: self [us] | cumulative | imported package"
+    for line in completed_proc.stderr.splitlines():
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[2] == 'gui_program':
+            return int(fields[1]) / 1e6
+
+
+def find_eager_modules():
+    code = (f'import sys, gui_program; '
+            f'print(",".join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))')
+    completed_proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                    cwd=path.dirname(BASELINE_FILE))
+    completed_proc.check_returncode()
+    return tuple(filter(None, completed_proc.stdout.strip().split(',')))
+
+
+def main():
+    eager_modules = find_eager_modules()
+    import_time = min(measure_import_time() for _ in range(REPEAT))
+    print(f"gui_program import time: {import_time:.3f} s (best of {REPEAT})")
+
+    ret = 0
+    if eager_modules:
+        print(f"FAIL: modules imported at start-up: {', '.join(eager_modules)}")
+        ret = 1
+
+    if '--update-baseline' in sys.argv:
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'import_time': import_time}, f, indent=4)
+        print(f"Baseline saved: {BASELINE_FILE}")
+    elif path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['import_time']
+        if import_time > baseline * TOLERANCE:
+            print(f"FAIL: import time regressed ({baseline:.3f} s -> {import_time:.3f} s)")
+            ret = 1
+    else:
+        print(f"FAIL: no baseline found ({BASELINE_FILE}). Run with --update-baseline to record one.")
+        ret = 1
+    return ret
+
+
+if __name__ == '__main__':
+    sys.exit(main())
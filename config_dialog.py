@@ -39,12 +39,17 @@ class ConfigDialog(QDialog):
         self.software_edit = QLineEdit(self.config.get('software', ''))
         self.software_edit.setReadOnly(True)
 
+        self.organization_code_edit = QLineEdit(self.config.get('organization_code', ''))
+        self.core_quota_edit = QLineEdit(str(self.config.get('core_quota', 0)))
+
 
         layout.addRow("API Key:", self.api_key_edit)
         layout.addRow("Project Code:", self.project_code_edit)
         layout.addRow("License Server:", self.license_server_edit)
         layout.addRow("API Base URL:", self.api_base_url_edit)
         layout.addRow("Software:", self.software_edit)
+        layout.addRow("Organization Code:", self.organization_code_edit)
+        layout.addRow("Core Quota (0: unlimited):", self.core_quota_edit)
 
         save_button = QPushButton("Save")
         save_button.clicked.connect(self.save_settings)
@@ -54,6 +59,12 @@ class ConfigDialog(QDialog):
 
     def save_settings(self):
         self.config['apikey'] = self.api_key_edit.text()
+        self.config['organization_code'] = self.organization_code_edit.text()
+        try:
+            self.config['core_quota'] = int(self.core_quota_edit.text() or 0)
+        except ValueError:
+            QMessageBox.warning(self, "Configuration", "Core Quota must be an integer.")
+            return
 
         self.save_config()
         QMessageBox.information(self, "Configuration", "Settings saved successfully.")
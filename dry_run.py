@@ -0,0 +1,111 @@
+import re
+from os import path
+import jobs_starccmp
+import sizing
+
+__all__ = ['check_selection', 'dry_run', 'format_report']
+
+VERSION_CODE_PATTERN = re.compile(r'^\d+\.\d+\.\d+(-r8)?-HKMC-aerot-\d{6}$')
+REQUIRED_CONFIG_KEYS = ('software', 'license_server', 'project_code')
+PLACEHOLDER_FILE_ID = 'DRYRUN'
+
+
+# 디렉토리별 .sim/.java 선택 개수 확인 (모든 문제를 한 번에 수집)
+def check_selection(selected_dirs, selected_sim_files, selected_java_files):
+    problems = []
+    for dir in selected_dirs:
+        sim_cnt = sum(1 for sim in selected_sim_files if dir in sim)
+        if sim_cnt != 1:
+            problems.append((dir, "선택된 sim 파일이 없습니다." if sim_cnt == 0 else "선택된 sim 파일이 너무 많습니다."))
+
+        java_cnt = sum(1 for java in selected_java_files if dir in java)
+        if java_cnt != 1:
+            problems.append((dir, "선택된 java 파일이 없습니다." if java_cnt == 0 else "선택된 java 파일이 너무 많습니다."))
+    return problems
+
+
+# 업로드할 파일의 존재 여부와 크기 확인 후 {파일: 크기} 반환
+def check_files(where, file_names, problems):
+    sizes = {}
+    for file_name in file_names:
+        if not path.exists(file_name):
+            problems.append((where, f"파일이 없습니다: {file_name}"))
+        elif path.getsize(file_name) == 0:
+            problems.append((where, f"빈 파일입니다: {file_name}"))
+        else:
+            sizes[file_name] = path.getsize(file_name)
+    return sizes
+
+
+# 선택 전체를 업로드 없이 검증: 작업 JSON 생성/검증, 파일 크기, 업로드 용량 및 코어-시간 추정
+#   entries: {'dir', 'sim_path', 'java_file', 'sim_file', 'upload_files'} 목록
+#            ('coretype', 'ncores', 'cells'가 있으면 자동 노드 산정 결과로 사용)
+#   packed: 묶음 작업별 케이스 목록 (packing.plan_packed_jobs 결과, coretype/ncores 공통)
+def dry_run(entries, config, version_code, coretype, ncores, walltime, models=None, packed=()):
+    report = {'jobs': 0, 'problems': [], 'upload_bytes': 0, 'core_hours_max': 0.0, 'core_hours_est': 0.0}
+    problems = report['problems']
+    models = models or {}
+
+    problems.extend(('설정', f"{key} 값이 없습니다.") for key in REQUIRED_CONFIG_KEYS if not config.get(key))
+    if not VERSION_CODE_PATTERN.match(version_code):
+        problems.append(('버전', f"잘못된 버전 코드입니다: {version_code}"))
+
+    for entry in entries:
+        dir = entry['dir']
+        entry_coretype, entry_ncores = entry.get('coretype', coretype), entry.get('ncores', ncores)
+        if entry_coretype not in jobs_starccmp.CORETYPES:
+            problems.append((dir, f"등록되지 않은 코어타입입니다: {entry_coretype}"))
+            continue
+        sizes = check_files(dir, entry['upload_files'], problems)
+        report['upload_bytes'] += sum(sizes.values())
+
+        job_data = jobs_starccmp.build_job(entry_coretype, [PLACEHOLDER_FILE_ID] * len(entry['upload_files']),
+                                           entry['java_file'], entry['sim_file'], entry['sim_file'].split('.')[0],
+                                           config.get('software', ''), version_code, config.get('license_server', ''),
+                                           "1", entry_ncores, walltime, config.get('project_code', ''))
+        problems.extend((dir, problem) for problem in jobs_starccmp.validate_job(job_data))
+        report['jobs'] += 1
+
+        report['core_hours_max'] += entry_ncores * float(walltime)
+        if entry['sim_path'] in sizes:
+            work = sizing.estimate_work(sizes[entry['sim_path']], entry.get('cells'))
+            runtime = sizing.predict_runtime(models.get(entry_coretype, sizing.DEFAULT_MODEL), work, entry_ncores)
+            report['core_hours_est'] += entry_ncores * min(runtime / 3600, float(walltime))
+
+    for cases in packed:
+        where = ', '.join(case['dir'] for case in cases)
+        if coretype not in jobs_starccmp.CORETYPES:
+            problems.append((where, f"등록되지 않은 코어타입입니다: {coretype}"))
+            continue
+        java_paths = cases[0].get('java_paths') or [cases[0]['java_path']]
+        upload_files = java_paths + [case['sim_path'] for case in cases]
+        sizes = check_files(where, upload_files, problems)
+        report['upload_bytes'] += sum(sizes.values())
+
+        job_data = jobs_starccmp.create_job_packed([PLACEHOLDER_FILE_ID] * len(upload_files),
+                                                   [(case['dir'], case['sim'], case['cores']) for case in cases],
+                                                   cases[0]['java'], f"{cases[0]['sim'].split('.')[0]}_x{len(cases)}",
+                                                   config.get('software', ''), version_code,
+                                                   config.get('license_server', ''), coretype, ncores, walltime,
+                                                   config.get('project_code', ''),
+                                                   [path.basename(java_path) for java_path in java_paths])
+        problems.extend((where, problem) for problem in jobs_starccmp.validate_job(job_data))
+        report['jobs'] += 1
+
+        # 묶음 작업은 가장 오래 걸리는 케이스가 끝날 때까지 전체 코어를 사용
+        report['core_hours_max'] += ncores * float(walltime)
+        runtimes = [sizing.predict_runtime(models.get(coretype, sizing.DEFAULT_MODEL),
+                                           sizing.estimate_work(sizes[case['sim_path']]), case['cores'])
+                    for case in cases if case['sim_path'] in sizes]
+        if runtimes:
+            report['core_hours_est'] += ncores * min(max(runtimes) / 3600, float(walltime))
+    return report
+
+
+def format_report(report):
+    lines = [f"작업 수: {report['jobs']}",
+             f"업로드 용량: {report['upload_bytes'] / 1073741824:.2f} GB",
+             f"예상 코어-시간: {report['core_hours_est']:.0f} (최대 {report['core_hours_max']:.0f})",
+             f"문제: {len(report['problems'])}건"]
+    lines.extend(f"  - {where}: {problem}" for where, problem in report['problems'])
+    return '\n'.join(lines)
@@ -0,0 +1,44 @@
+import json
+from os import path, stat
+from threading import Lock
+
+__all__ = ['FileIndex']
+
+FILE_INDEX_FILE = "file_index.json"
+DEFAULT_ALGORITHM = 'sha512'
+
+
+# 전송 중 계산한 해시를 로컬 파일 경로별로 기록 (크기/수정 시각이 바뀌면 무효)
+class FileIndex:
+    def __init__(self, index_file: str = FILE_INDEX_FILE):
+        self.index_file = index_file
+        self.lock = Lock()
+        self.entries = self.load()
+
+    def load(self):
+        if not path.exists(self.index_file):
+            return {}
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self):
+        with open(self.index_file, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=4)
+
+    def record(self, file_path: str, algorithm: str, digest: str, file_id=None):
+        file_stat = stat(file_path)
+        with self.lock:
+            self.entries[path.abspath(file_path)] = {'size': file_stat.st_size, 'mtime': file_stat.st_mtime,
+                                                    'algorithm': algorithm, 'digest': digest, 'file_id': file_id}
+            self.save()
+
+    # 파일이 기록 이후 바뀌지 않았으면 항목 반환
+    def get(self, file_path: str):
+        with self.lock:
+            entry = self.entries.get(path.abspath(file_path))
+        if entry is None or not path.exists(file_path):
+            return None
+
+        file_stat = stat(file_path)
+        if entry['size'] == file_stat.st_size and entry['mtime'] == file_stat.st_mtime:
+            return entry
@@ -1,24 +1,27 @@
-import csv
 import json
 import sys
+from functools import cached_property
 from os import path, walk
-from threading import Lock
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel, QTextEdit,
                             QComboBox, QRadioButton, QPushButton, QListWidget, QMessageBox,
-                            QAbstractItemView, QMainWindow, QFileDialog, QTabWidget)
-from PyQt6.QtCore import QThreadPool, pyqtSignal, QObject
+                            QAbstractItemView, QMainWindow, QFileDialog, QTabWidget, QCheckBox)
+from PyQt6.QtCore import Qt, QThreadPool, QTimer, pyqtSignal, QObject
 from PyQt6.QtGui import QIcon, QAction
-from config_dialog import ConfigDialog
-from worker import SubmitWorker
-from api import RescaleAPI
+from worker import SubmitWorker, PackedSubmitWorker, HarvestWorker, HistoryRefreshWorker, StatusPollWorker, LiveTailWorker
+from api import RescaleAPI, DEFAULT_CACHE_TTL
+import jobs_starccmp
+import sizing
+import dry_run
+from scheduler import SubmissionScheduler, PRIORITY_LEVELS
+from live_tail import LiveTailManager, DEFAULT_MAX_TAILS
+from transfers import TransferManager, BandwidthLimiter, parse_bandwidth_schedule
 
 
 CONFIG_FILE = "config_miscellaneous.json"
-CORETYPE_CONFIGURATION = {
-    "hematite": 64,
-    "natrolite": 96
-}
 DEFAULT_NODE_COUNT = 3
+STATUS_POLL_INTERVAL = 60000 # 1분
+LIVE_TAIL_INTERVAL = 15000 # 15초
+TRANSFER_REFRESH_INTERVAL = 2000 # 2초
 
 class LogStream(QObject):
     new_log = pyqtSignal(str)
@@ -32,20 +35,68 @@ class LogStream(QObject):
 class GUIProgram(QMainWindow):
     job_status_updated = pyqtSignal()
     log_signal = pyqtSignal(str)
+    job_state_signal = pyqtSignal(str, str)
 
     def __init__(self):
         super().__init__()
         self.config = self.load_config()
-        self.api = RescaleAPI(self.config['apibaseurl'], self.config['apikey'])
+        self.api = RescaleAPI(self.config['apibaseurl'], self.config['apikey'],
+                              float(self.config.get('api_cache_ttl', DEFAULT_CACHE_TTL)))
         self.threadpool = QThreadPool()
         self.job_threadpool = QThreadPool()
         self.job_threadpool.setMaxThreadCount(1)
         self.node_count = DEFAULT_NODE_COUNT
+        self.packed_jobs = {}
+        self.scheduler = SubmissionScheduler(self.job_threadpool, int(self.config.get('core_quota', 0)))
+        self.polling = False
+        self.license_gate = self.create_license_gate()
 
         self.init_ui()
         self.update_node_core_labels()
         self.log_signal.connect(self.update_log)
 
+        self.job_state_signal.connect(self.job_state_changed)
+        self.notification_source = None
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_job_statuses)
+
+        self.live_tails = LiveTailManager(self.api, int(self.config.get('max_live_tails', DEFAULT_MAX_TAILS)))
+        self.live_tail_timer = QTimer(self)
+        self.live_tail_timer.timeout.connect(self.poll_live_tails)
+
+        # 창이 표시된 뒤 백그라운드 기능 시작
+        QTimer.singleShot(0, self.start_background_services)
+
+    # 네트워크 수신기 및 주기적 상태 확인 시작 (시작 시간 단축을 위해 지연 실행)
+    def start_background_services(self):
+        self.notification_source = self.start_notification_source()
+        # 알림 수신기가 동작하면 상태 확인(polling)은 보조 수단으로 주기를 늘림
+        self.poll_timer.start(STATUS_POLL_INTERVAL * (5 if self.notification_source else 1))
+        self.live_tail_timer.start(LIVE_TAIL_INTERVAL)
+
+        # 이전 실행에서 남은 다운로드 재개 (중단된 업로드는 다시 제출하도록 안내)
+        if self.transfer_manager.items:
+            self.transfer_manager.start()
+        orphaned = self.transfer_manager.orphaned_uploads()
+        if orphaned:
+            self.log_signal.emit(f"이전 실행에서 제출되지 않은 업로드 {len(orphaned)}건은 재개하지 않습니다. "
+                                 f"Transfers 탭에서 확인 후 해당 디렉토리를 다시 제출하세요.")
+        self.transfer_timer = QTimer(self)
+        self.transfer_timer.timeout.connect(self.refresh_transfer_list)
+        self.transfer_timer.start(TRANSFER_REFRESH_INTERVAL)
+
+    # 업로드/다운로드 대기열 (config의 bandwidth_limit, bandwidth_schedule 적용)
+    @cached_property
+    def transfer_manager(self):
+        limiter = BandwidthLimiter(int(self.config.get('bandwidth_limit', 0)),
+                                   parse_bandwidth_schedule(self.config.get('bandwidth_schedule', {})))
+        return TransferManager(self.api, limiter=limiter)
+
+    # 실행 이력은 처음 사용할 때 읽음
+    @cached_property
+    def runtime_history(self):
+        return sizing.RuntimeHistory()
+
     # UI 초기화
     def init_ui(self):
         self.setWindowTitle("Rescale AutoPilot-S for HKMC R&D Aerodynamics Development Team")
@@ -60,8 +111,12 @@ class GUIProgram(QMainWindow):
         self.tab_widget = QTabWidget()
         self.tab_main = QWidget()
         self.tab_log = QWidget()
+        self.tab_live_tail = QWidget()
         self.tab_widget.addTab(self.tab_main, "Main")
         self.tab_widget.addTab(self.tab_log, "Log")
+        self.tab_widget.addTab(self.tab_live_tail, "Live Tail")
+        self.tab_transfers = QWidget()
+        self.tab_widget.addTab(self.tab_transfers, "Transfers")
         
         self.main_layout.addWidget(self.tab_widget)
 
@@ -81,6 +136,12 @@ class GUIProgram(QMainWindow):
         self.log_text_edit.setReadOnly(True)
         log_layout = QVBoxLayout(self.tab_log)
         log_layout.addWidget(self.log_text_edit)
+
+        # Live Tail Tab 설정
+        self.setup_live_tail_layout()
+
+        # Transfers Tab 설정
+        self.setup_transfer_layout()
         
         # Redirect stdout to log text edit
         self.log_stream = LogStream()
@@ -114,7 +175,7 @@ class GUIProgram(QMainWindow):
         self.job_type_group = self.create_radio_group("작업 유형:", ["통합 작업"])        
 
         # 코어타입 유형 선택 (Radio Group을 작업 설정 그룹에 포함)
-        self.coretype_group = self.create_radio_group("코어타입:", ["hematite", "natrolite"])
+        self.coretype_group = self.create_radio_group("코어타입:", list(jobs_starccmp.CORETYPES))
         self.coretype_group.findChildren(QRadioButton)[0].setChecked(True)
         job_settings_layout.addWidget(self.coretype_group)
 
@@ -146,6 +207,25 @@ class GUIProgram(QMainWindow):
         walltime_layout.addWidget(self.walltime_combo)
         job_settings_layout.addLayout(walltime_layout)
 
+        # 제출 우선순위 설정
+        priority_layout = QHBoxLayout()
+        priority_label = QLabel("제출 우선순위:")
+        self.priority_combo = QComboBox()
+        self.priority_combo.addItems(PRIORITY_LEVELS.keys())
+        self.priority_combo.setCurrentText("보통")
+        priority_layout.addWidget(priority_label)
+        priority_layout.addWidget(self.priority_combo)
+        job_settings_layout.addLayout(priority_layout)
+
+        # 소형 케이스 묶음 실행 설정
+        self.packing_check_box = QCheckBox("소형 케이스 묶음 실행")
+        job_settings_layout.addWidget(self.packing_check_box)
+
+        # 실행 이력 기반 자동 노드 산정 설정
+        self.auto_sizing_check_box = QCheckBox("자동 노드 산정 (실행 이력 기반)")
+        self.auto_sizing_check_box.toggled.connect(self.auto_sizing_toggled)
+        job_settings_layout.addWidget(self.auto_sizing_check_box)
+
         self.job_settings_group.setLayout(job_settings_layout)
         self.left_layout.addWidget(self.job_settings_group)
 
@@ -185,7 +265,16 @@ class GUIProgram(QMainWindow):
         self.execute_button = QPushButton("작업 실행")
         self.execute_button.setEnabled(False)  # 초기 상태에서는 비활성화
         self.execute_button.clicked.connect(self.submit_job)
-        self.left_layout.addWidget(self.execute_button)
+
+        # 업로드 없이 선택 전체를 점검
+        self.dry_run_button = QPushButton("사전 점검")
+        self.dry_run_button.setEnabled(False)
+        self.dry_run_button.clicked.connect(self.run_dry_run)
+
+        execute_layout = QHBoxLayout()
+        execute_layout.addWidget(self.dry_run_button)
+        execute_layout.addWidget(self.execute_button)
+        self.left_layout.addLayout(execute_layout)
 
     # 오른쪽 레이아웃 설정
     def setup_right_layout(self):
@@ -207,6 +296,42 @@ class GUIProgram(QMainWindow):
         group_box.setLayout(layout)
         self.right_layout.addWidget(group_box)
 
+    # 전송 대기열 레이아웃 설정
+    def setup_transfer_layout(self):
+        transfer_layout = QVBoxLayout(self.tab_transfers)
+        self.transfer_list_widget = QListWidget()
+        self.transfer_list_widget.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        transfer_layout.addWidget(self.transfer_list_widget)
+
+        button_layout = QHBoxLayout()
+        for text, func in (("일시 정지", self.pause_transfer), ("재개", self.resume_transfer),
+                           ("취소", self.cancel_transfer), ("완료 항목 정리", self.clear_transfers)):
+            button_layout.addWidget(self.create_node_button(text, func))
+        transfer_layout.addLayout(button_layout)
+
+    # 실행 중인 작업 로그의 실시간 추적 레이아웃 설정
+    def setup_live_tail_layout(self):
+        live_tail_layout = QVBoxLayout(self.tab_live_tail)
+
+        control_layout = QHBoxLayout()
+        self.live_tail_combo = QComboBox()
+        refresh_button = QPushButton("작업 목록 갱신")
+        refresh_button.clicked.connect(self.refresh_live_tail_jobs)
+        start_button = QPushButton("추적 시작")
+        start_button.clicked.connect(self.start_live_tail)
+        stop_button = QPushButton("추적 중지")
+        stop_button.clicked.connect(self.stop_live_tail)
+        control_layout.addWidget(QLabel("실행 중인 작업:"))
+        control_layout.addWidget(self.live_tail_combo)
+        control_layout.addWidget(refresh_button)
+        control_layout.addWidget(start_button)
+        control_layout.addWidget(stop_button)
+        live_tail_layout.addLayout(control_layout)
+
+        self.live_tail_tabs = QTabWidget()
+        self.live_tail_panels = {}
+        live_tail_layout.addWidget(self.live_tail_tabs)
+
     # 메뉴 생성
     def create_menu(self):
         menubar = self.menuBar()
@@ -216,6 +341,12 @@ class GUIProgram(QMainWindow):
         edit_action.triggered.connect(self.open_config_dialog)
         config_menu.addAction(edit_action)
 
+        job_menu = menubar.addMenu('작업')
+
+        harvest_action = QAction('묶음 작업 결과 다운로드', self)
+        harvest_action.triggered.connect(self.harvest_packed_jobs)
+        job_menu.addAction(harvest_action)
+
     # 노드 레이아웃 생성
     def create_node_layout(self):
         layout = QHBoxLayout()
@@ -237,7 +368,7 @@ class GUIProgram(QMainWindow):
 
     def update_node_core_labels(self):
         self.coretype = self.get_selected_coretype()
-        self.cores_per_node = CORETYPE_CONFIGURATION.get(self.coretype, 0)
+        self.cores_per_node = jobs_starccmp.CORETYPES.get(self.coretype, {}).get('cores_per_node', 0)
         self.node_label.setText(f"{self.coretype} : {self.node_count}")
         self.core_label.setText(f"    코어 수: {self.node_count * self.cores_per_node}")
 
@@ -267,18 +398,189 @@ class GUIProgram(QMainWindow):
     def job_error(self, error):
         QMessageBox.critical(self, "Error", str(error[1]))
 
+    # 실행 중인 작업의 상태를 확인하여 완료된 작업의 코어를 반환
+    def poll_job_statuses(self):
+        job_ids = self.scheduler.running_job_ids()
+        if self.polling or not job_ids:
+            return
+
+        self.polling = True
+        poll_worker = StatusPollWorker(self.api, job_ids, self.log_signal)
+        poll_worker.signals.result.connect(self.jobs_polled)
+        self.threadpool.start(poll_worker)
+
+    def jobs_polled(self, statuses):
+        self.polling = False
+        for job_id, status in statuses.items():
+            self.job_state_changed(job_id, status)
+
+    # 상태 확인(polling)과 알림 수신기가 공통으로 사용하는 작업 상태 변경 처리
+    def job_state_changed(self, job_id, status):
+        # 실행이 시작되면 checkout 유예 시간 뒤, 완료되면 즉시 라이선스 예약 해제
+        if self.license_gate and status == 'Executing':
+            self.license_gate.started(job_id)
+        elif self.license_gate and status == 'Completed':
+            self.license_gate.release(job_id)
+
+        if status != 'Completed' or job_id not in self.scheduler.running_job_ids():
+            return
+
+        self.log_signal.emit(f'The job is completed (Job ID: {job_id})')
+        self.scheduler.job_completed(job_id)
+        self.threadpool.start(HistoryRefreshWorker(self.api, self.runtime_history, self.log_signal))
+
+    # 설정의 license_gate가 true이면 제출 전에 라이선스 서버의 여유 토큰을 확인
+    def create_license_gate(self):
+        if not self.config.get('license_gate', False):
+            return None
+
+        from license_gate import LicenseGate, LmutilLicenseChecker, DEFAULT_CACHE_INTERVAL, DEFAULT_CHECKOUT_GRACE
+        checker = LmutilLicenseChecker(self.config['license_server'], self.config.get('lmutil_path', 'lmutil'))
+        return LicenseGate(checker, cache_interval=float(self.config.get('license_cache_interval', DEFAULT_CACHE_INTERVAL)),
+                           checkout_grace=float(self.config.get('license_checkout_grace', DEFAULT_CHECKOUT_GRACE)))
+
+    # 설정에 notification_port가 있으면 내장 알림 수신기 시작
+    def start_notification_source(self):
+        port = int(self.config.get('notification_port', 0))
+        if not port:
+            return None
+
+        from notifications import HttpNotificationReceiver
+
+        source = HttpNotificationReceiver(self.job_state_signal.emit, self.config.get('notification_host', '127.0.0.1'),
+                                          port, self.config.get('notification_token', ''))
+        try:
+            source.start()
+        except OSError as e:
+            self.log_signal.emit(f"Failed to start the notification receiver: {e}")
+            return None
+        self.log_signal.emit(f"Notification receiver is listening on {source.url}")
+        return source
+
+    def closeEvent(self, event):
+        if self.notification_source:
+            self.notification_source.stop()
+        if self.license_gate:
+            self.license_gate.stop()
+        super().closeEvent(event)
+
+    # 전송 대기열
+    def refresh_transfer_list(self):
+        items = self.transfer_manager.snapshot()
+        selected = {item.data(Qt.ItemDataRole.UserRole) for item in self.transfer_list_widget.selectedItems()}
+        self.transfer_list_widget.clear()
+        for item in items:
+            percent = item['transferred'] * 100 // item['size'] if item['size'] else 100
+            text = f"[{item['state']}] {item['kind']} {item['name']} ({percent}%)"
+            if item['error']:
+                text += f" - {item['error']}"
+            self.transfer_list_widget.addItem(text)
+            list_item = self.transfer_list_widget.item(self.transfer_list_widget.count() - 1)
+            list_item.setData(Qt.ItemDataRole.UserRole, item['id'])
+            list_item.setSelected(item['id'] in selected)
+
+    def selected_transfer_ids(self):
+        return tuple(item.data(Qt.ItemDataRole.UserRole) for item in self.transfer_list_widget.selectedItems())
+
+    def pause_transfer(self):
+        for item_id in self.selected_transfer_ids():
+            self.transfer_manager.pause(item_id)
+        self.refresh_transfer_list()
+
+    def resume_transfer(self):
+        for item_id in self.selected_transfer_ids():
+            self.transfer_manager.resume(item_id)
+        self.refresh_transfer_list()
+
+    def cancel_transfer(self):
+        for item_id in self.selected_transfer_ids():
+            self.transfer_manager.cancel(item_id)
+        self.refresh_transfer_list()
+
+    def clear_transfers(self):
+        self.transfer_manager.remove_finished()
+        self.refresh_transfer_list()
+
+    # 실시간 로그 추적
+    def refresh_live_tail_jobs(self):
+        self.live_tail_combo.clear()
+        self.live_tail_combo.addItems(self.scheduler.running_job_ids())
+
+    def start_live_tail(self):
+        job_id = self.live_tail_combo.currentText()
+        if not job_id:
+            return
+        if not self.live_tails.start(job_id):
+            QMessageBox.warning(self, "Warning", f"동시에 추적할 수 있는 작업은 최대 {self.live_tails.max_tails}개입니다.")
+            return
+
+        if job_id not in self.live_tail_panels:
+            panel = QTextEdit()
+            panel.setReadOnly(True)
+            self.live_tail_panels[job_id] = panel
+            self.live_tail_tabs.addTab(panel, job_id)
+        self.live_tail_tabs.setCurrentWidget(self.live_tail_panels[job_id])
+
+    def stop_live_tail(self):
+        panel = self.live_tail_tabs.currentWidget()
+        for job_id, item in tuple(self.live_tail_panels.items()):
+            if item is panel:
+                self.live_tails.stop(job_id)
+                self.live_tail_tabs.removeTab(self.live_tail_tabs.indexOf(panel))
+                del self.live_tail_panels[job_id]
+
+    def poll_live_tails(self):
+        for log_tail in self.live_tails.acquire_idle():
+            live_tail_worker = LiveTailWorker(log_tail, self.log_signal)
+            live_tail_worker.signals.result.connect(self.live_tail_updated)
+            self.threadpool.start(live_tail_worker)
+
+    def live_tail_updated(self, result):
+        log_tail, text, rows, finished = result
+        job_id = log_tail.job_id
+        self.live_tails.release(log_tail)
+        # 중지 후 다시 시작한 작업에 이전 LogTail의 늦은 결과가 섞이지 않도록 무시
+        if not self.live_tails.is_current(log_tail):
+            return
+        panel = self.live_tail_panels.get(job_id)
+        if panel is None:
+            return
+
+        if text:
+            panel.moveCursor(panel.textCursor().MoveOperation.End)
+            panel.insertPlainText(text)
+            panel.verticalScrollBar().setValue(panel.verticalScrollBar().maximum())
+        if rows:
+            iteration, residuals = rows[-1]
+            summary = ', '.join(f'{name} {value:.2e}' for name, value in residuals.items())
+            self.live_tail_tabs.setTabToolTip(self.live_tail_tabs.indexOf(panel), f'Iteration {iteration}: {summary}')
+            self.live_tail_tabs.setTabText(self.live_tail_tabs.indexOf(panel), f'{job_id} ({iteration})')
+        if finished:
+            self.live_tails.stop(job_id)
+            self.live_tail_tabs.setTabText(self.live_tail_tabs.indexOf(panel), f'{job_id} (완료)')
+
+    def auto_sizing_toggled(self, checked):
+        if checked:
+            self.threadpool.start(HistoryRefreshWorker(self.api, self.runtime_history, self.log_signal))
+
+    def packed_job_submitted(self, result):
+        job_id, case_dirs, case_inputs = result
+        self.packed_jobs[job_id] = (case_dirs, case_inputs)
+
+    def packed_job_harvested(self, job_id):
+        self.packed_jobs.pop(job_id, None)
+
 
     # 이벤트 함수
     def dir_clicked(self):
         self.sim_list_widget.clear()
         self.java_list_widget.clear()
         self.java_combo_box.clear()
-        selected_dirs = tuple(item.text() for item in self.dir_list_widget.selectedItems())
+        selected_dirs = set(item.text() for item in self.dir_list_widget.selectedItems())
 
         if len(selected_dirs):
             self.sim_list_widget.addItems(tuple(sf for sf in self._sim_files if sf.split('\\')[0] in selected_dirs))
-            for i in range(self.sim_list_widget.count()):
-                self.sim_list_widget.item(i).setSelected(True)
+            self.sim_list_widget.selectAll()
 
             java_files = tuple(jf for jf in self._java_files if jf.split('\\')[0] in selected_dirs)
             self.java_list_widget.addItems(java_files)
@@ -303,39 +605,148 @@ class GUIProgram(QMainWindow):
                 self.java_list_widget.item(i).setSelected(False)
 
 
-    # 작업 제출
+    # 작업 제출: 선택 전체를 사전 점검한 뒤 문제가 없을 때만 대기열에 추가
     def submit_job(self):
         if not self.validate_inputs():
             return
 
         toText = lambda x: x.text()
-        selected_sim_files = tuple(map(toText, self.sim_list_widget.selectedItems()))
-        selected_java_files = tuple(map(toText, self.java_list_widget.selectedItems()))
-        all_java_items = tuple(self.java_list_widget.item(i) for i in range(self.java_list_widget.count()))
-
-        for dir in map(toText, self.dir_list_widget.selectedItems()):
-            dir_java_file = tuple(filter(lambda x: dir in x, selected_java_files))[0] # CMD
-            dir_sim_file = list(filter(lambda x: dir in x, selected_sim_files))[0] # CMD
-
-            dirname = self._dir_dict[dir]['dirname']
-            upload_files = [path.join(dirname, item) for item in map(toText, all_java_items) if dir in item] # Upload
-            upload_files.append(path.join(dirname, dir_sim_file))
+        packed_plans, entries = self.plan_submissions(tuple(map(toText, self.dir_list_widget.selectedItems())),
+                                                      tuple(map(toText, self.sim_list_widget.selectedItems())),
+                                                      tuple(map(toText, self.java_list_widget.selectedItems())))
+        report = self.check_submissions(packed_plans, entries)
+        if report['problems']:
+            self.log_signal.emit(dry_run.format_report(report))
+            QMessageBox.warning(self, "Warning",
+                                '\n'.join(f"{where}: {problem}" for where, problem in report['problems']))
+            return
 
+        self.submit_packed_jobs(packed_plans)
+        for entry in entries:
             # Submit the job
             submit_worker = SubmitWorker(
                 self.get_selected_radio_button_text(self.job_type_group),
                 self.config,
                 self.extract_version_code(self.version_combo.currentText()),
-                self.get_selected_radio_button_text(self.coretype_group),
-                self.node_count * self.cores_per_node,
+                entry['coretype'],
+                entry['ncores'],
                 self.walltime_combo.currentText(),
-                upload_files,           # 업로드할 파일들
-                dir_java_file,          # .java 파일 이름
-                dir_sim_file,           # .sim 파일 이름
+                entry['upload_files'],  # 업로드할 파일들
+                entry['java_file'],     # .java 파일 이름
+                entry['sim_file'],      # .sim 파일 이름
                 self.log_signal,        # 로그 시그널 전달
+                self.api,               # 공유 API 클라이언트
+                self.license_gate,      # 라이선스 확인
+                self.transfer_manager,  # 전송 대기열
             )
             submit_worker.signals.error.connect(self.job_error)
-            self.job_threadpool.start(submit_worker)
+            submit_worker.signals.result.connect(
+                lambda job_id, e=entry: self.runtime_history.record_submission(job_id, e['coretype'], e['ncores'],
+                                                                               e['sim_size'], e['cells']))
+            self.scheduler.enqueue(submit_worker, entry['ncores'], PRIORITY_LEVELS[self.priority_combo.currentText()],
+                                   entry['sim_size'], dispatch=False)
+
+        # 전체 선택을 대기열에 넣은 뒤 우선순위 순서대로 제출 시작
+        self.scheduler.dispatch()
+
+    # 선택한 디렉토리를 묶음 작업과 단독 작업으로 나누고, 단독 작업의 코어타입 및 코어 수 결정
+    #   (묶음 사용 시 호환되는 소형 케이스를 묶고, 자동 노드 산정 시 디렉토리별로 산정)
+    def plan_submissions(self, selected_dirs, selected_sim_files, selected_java_files):
+        all_java_files = tuple(self.java_list_widget.item(i).text() for i in range(self.java_list_widget.count()))
+
+        packed_plans = []
+        if self.packing_check_box.isChecked():
+            packed_plans, selected_dirs = self.plan_packed_jobs(selected_dirs, selected_sim_files, selected_java_files)
+
+        entries = []
+        for dir in selected_dirs:
+            dir_java_file = tuple(filter(lambda x: dir in x, selected_java_files))[0] # CMD
+            dir_sim_file = list(filter(lambda x: dir in x, selected_sim_files))[0] # CMD
+
+            dirname = self._dir_dict[dir]['dirname']
+            upload_files = [path.join(dirname, item) for item in all_java_files if dir in item] # Upload
+            upload_files.append(path.join(dirname, dir_sim_file))
+
+            sim_path = path.join(dirname, dir_sim_file)
+            sim_size = path.getsize(sim_path) if path.exists(sim_path) else 0
+            cells = None
+            coretype = self.get_selected_radio_button_text(self.coretype_group)
+            ncores = self.node_count * self.cores_per_node
+            if self.auto_sizing_check_box.isChecked() and sim_size:
+                cells = sizing.read_cell_count(sim_path)
+                coretype, node_count, runtime = sizing.choose_size(sizing.estimate_work(sim_size, cells),
+                                                                   self.runtime_history.models(),
+                                                                   jobs_starccmp.coretype_cores())
+                ncores = node_count * jobs_starccmp.CORETYPES[coretype]['cores_per_node']
+                self.log_signal.emit(f"{dir}: {coretype} x {node_count} 노드 ({ncores} 코어), "
+                                     f"예상 실행 시간 {runtime / 3600:.1f} 시간")
+
+            entries.append({'dir': dir, 'sim_path': sim_path, 'sim_file': dir_sim_file, 'java_file': dir_java_file,
+                            'upload_files': upload_files, 'sim_size': sim_size, 'cells': cells,
+                            'coretype': coretype, 'ncores': ncores})
+        return packed_plans, entries
+
+    # 작업 JSON, 파일 크기, 버전, 설정을 선택 전체에 대해 한 번에 점검
+    def check_submissions(self, packed_plans, entries):
+        return dry_run.dry_run(entries, self.config, self.extract_version_code(self.version_combo.currentText()),
+                               self.get_selected_radio_button_text(self.coretype_group),
+                               self.node_count * self.cores_per_node, self.walltime_combo.currentText(),
+                               self.runtime_history.models(), packed_plans)
+
+    # 호환되는 소형 케이스를 묶고, (묶음 목록, 단독 실행할 디렉토리)를 반환
+    def plan_packed_jobs(self, selected_dirs, selected_sim_files, selected_java_files):
+        import packing
+
+        version = self.extract_version_code(self.version_combo.currentText())
+        coretype = self.get_selected_radio_button_text(self.coretype_group)
+        ncores = self.node_count * self.cores_per_node
+
+        all_java_files = tuple(self.java_list_widget.item(i).text() for i in range(self.java_list_widget.count()))
+        cases = []
+        for dir in selected_dirs:
+            dirname = self._dir_dict[dir]['dirname']
+            java_file = tuple(filter(lambda x: dir in x, selected_java_files))[0]
+            sim_file = tuple(filter(lambda x: dir in x, selected_sim_files))[0]
+            cases.append({'dir': dir, 'dirname': dirname, 'version': version, 'coretype': coretype,
+                          'java': java_file.split('\\')[-1], 'java_path': path.join(dirname, java_file),
+                          'java_paths': [path.join(dirname, item) for item in all_java_files if dir in item],
+                          'sim': sim_file.split('\\')[-1], 'sim_path': path.join(dirname, sim_file)})
+
+        packed_plans, single_dirs = [], []
+        for packed in packing.plan_packed_jobs(cases, ncores):
+            if len(packed) == 1:
+                single_dirs.append(packed[0]['dir'])
+            else:
+                packed_plans.append(packed)
+        return packed_plans, tuple(dir for dir in selected_dirs if dir in single_dirs)
+
+    # 묶음 작업을 제출 대기열에 추가
+    def submit_packed_jobs(self, packed_plans):
+        version = self.extract_version_code(self.version_combo.currentText())
+        coretype = self.get_selected_radio_button_text(self.coretype_group)
+        ncores = self.node_count * self.cores_per_node
+
+        for packed in packed_plans:
+            packed_worker = PackedSubmitWorker(self.config, version, coretype, ncores,
+                                               self.walltime_combo.currentText(), packed, self.log_signal, self.api,
+                                               self.license_gate, self.transfer_manager)
+            packed_worker.signals.result.connect(self.packed_job_submitted)
+            packed_worker.signals.error.connect(self.job_error)
+            self.scheduler.enqueue(packed_worker, ncores, PRIORITY_LEVELS[self.priority_combo.currentText()],
+                                   sum(path.getsize(case['sim_path']) for case in packed), dispatch=False)
+
+    # 완료된 묶음 작업의 결과를 케이스별 디렉토리로 다운로드
+    def harvest_packed_jobs(self):
+        if not self.packed_jobs:
+            self.log_signal.emit("다운로드할 묶음 작업이 없습니다.")
+            return
+
+        for job_id, (case_dirs, case_inputs) in tuple(self.packed_jobs.items()):
+            harvest_worker = HarvestWorker(self.api, job_id, case_dirs, case_inputs, self.log_signal,
+                                           self.transfer_manager)
+            harvest_worker.signals.finished.connect(self.packed_job_harvested)
+            harvest_worker.signals.error.connect(self.job_error)
+            self.threadpool.start(harvest_worker)
 
     # 입력 파일 경로 설정
     def open_input_directory_dialog(self):
@@ -381,19 +792,19 @@ class GUIProgram(QMainWindow):
             self.java_combo_box.addItem('Manual')
             self.java_combo_box.addItems(sorted(set(list(map(lambda j: j.split('\\')[-1], self._java_files)))))
 
-        # 기본적으로 모든 디렉토리를 선택
-        for index in range(self.dir_list_widget.count()):
-            self.dir_list_widget.item(index).setSelected(True)
+        # 기본적으로 모든 디렉토리를 선택 (항목별로 선택하면 dir_clicked가 디렉토리 수만큼 실행됨)
+        self.dir_list_widget.selectAll()
 
         # 기본적으로 모든 .sim 파일을 선택
-        for index in range(self.sim_list_widget.count()):
-            self.sim_list_widget.item(index).setSelected(True)
+        self.sim_list_widget.selectAll()
 
         # 파일이 발견되면 실행 버튼 활성화
         if len(self._sim_files) and len(self._java_files):
             self.execute_button.setEnabled(True)
+            self.dry_run_button.setEnabled(True)
         else:
             self.execute_button.setEnabled(False)
+            self.dry_run_button.setEnabled(False)
 
     # 기타 유틸리티 메서드
     def validate_inputs(self):
@@ -401,27 +812,44 @@ class GUIProgram(QMainWindow):
             QMessageBox.warning(self, "Warning", "선택된 디렉토리가 없습니다.")
             return False
 
+        # 모든 디렉토리의 문제를 한 번에 표시
         toText = lambda x: x.text()
-        for dir in map(toText, self.dir_list_widget.selectedItems()):
-            sim_cnt = sum([1 for sim in map(toText, self.sim_list_widget.selectedItems()) if dir in sim])
-            if sim_cnt != 1:
-                if sim_cnt == 0:
-                    msg = f"{dir}에 선택된 sim 파일이 없습니다."
-                else:
-                    msg = f"{dir}에 선택된 sim 파일이 너무 많습니다."
-                QMessageBox.warning(self, "Warning", msg)
-                return
-
-            java_cnt = sum([1 for java in map(toText, self.java_list_widget.selectedItems()) if dir in java])
-            if java_cnt != 1:
-                if java_cnt == 0:
-                    msg = f"{dir}에 선택된 java 파일이 없습니다."
-                else:
-                    msg = f"{dir}에 선택된 java 파일이 너무 많습니다."
-                QMessageBox.warning(self, "Warning", msg)
-                return
+        problems = dry_run.check_selection(tuple(map(toText, self.dir_list_widget.selectedItems())),
+                                           tuple(map(toText, self.sim_list_widget.selectedItems())),
+                                           tuple(map(toText, self.java_list_widget.selectedItems())))
+        if problems:
+            QMessageBox.warning(self, "Warning", '\n'.join(f"{dir}: {msg}" for dir, msg in problems))
+            return
         return True
 
+    # 사전 점검: 선택 전체의 작업 JSON, 파일 크기, 업로드 용량, 코어-시간을 한 번에 확인
+    #   (제출과 같은 방식으로 묶음 작업 및 자동 노드 산정 적용)
+    def run_dry_run(self):
+        toText = lambda x: x.text()
+        selected_dirs = tuple(map(toText, self.dir_list_widget.selectedItems()))
+        selected_sim_files = tuple(map(toText, self.sim_list_widget.selectedItems()))
+        selected_java_files = tuple(map(toText, self.java_list_widget.selectedItems()))
+        if not selected_dirs:
+            QMessageBox.warning(self, "Warning", "선택된 디렉토리가 없습니다.")
+            return
+
+        problems = dry_run.check_selection(selected_dirs, selected_sim_files, selected_java_files)
+        invalid_dirs = set(dir for dir, _ in problems)
+        packed_plans, entries = self.plan_submissions(tuple(dir for dir in selected_dirs if dir not in invalid_dirs),
+                                                      selected_sim_files, selected_java_files)
+        report = self.check_submissions(packed_plans, entries)
+        report['problems'][:0] = problems
+        text = dry_run.format_report(report)
+        self.log_signal.emit(text)
+
+        message_box = QMessageBox(self)
+        message_box.setWindowTitle("사전 점검")
+        message_box.setIcon(QMessageBox.Icon.Warning if report['problems'] else QMessageBox.Icon.Information)
+        message_box.setText('\n'.join(text.split('\n')[:4]))
+        if report['problems']:
+            message_box.setDetailedText(text)
+        message_box.exec()
+
     # 선택한 메뉴에서 소프트웨어 버전 정보 추출
     def extract_version_code(self, version_text):
         version = version_text.split(' ')[0]
@@ -430,9 +858,12 @@ class GUIProgram(QMainWindow):
         return f"{version}-HKMC-aerot-231207"
 
     def open_config_dialog(self):
+        from config_dialog import ConfigDialog
         config_dialog = ConfigDialog(CONFIG_FILE, self)
         if config_dialog.exec():
             self.config = config_dialog.config
+            self.scheduler.core_quota = int(self.config.get('core_quota', 0))
+            self.scheduler.dispatch()
 
     # UI 구성 도우미 메서드
     def create_radio_group(self, title, options):
@@ -448,7 +879,7 @@ class GUIProgram(QMainWindow):
     def create_node_control(self):
         coretype = self.get_selected_coretype()
         node_label = QLabel(f"{coretype} : {DEFAULT_NODE_COUNT}")
-        core_label = QLabel(f"    코어 수: {DEFAULT_NODE_COUNT * CORETYPE_CONFIGURATION[coretype]}")
+        core_label = QLabel(f"    코어 수: {DEFAULT_NODE_COUNT * jobs_starccmp.CORETYPES[coretype]['cores_per_node']}")
         return node_label, core_label
 
     def create_node_button(self, text, func):
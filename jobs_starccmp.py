@@ -1,88 +1,113 @@
 import os
 import json
+from functools import lru_cache
 
 
+# 코어타입 레지스트리: 노드당 코어 수 및 MPI 설정(export 환경 변수)
+CORETYPES = {}
 
-# 통합 작업: HBv4
-def create_job_hbv4(file_ids, java_file_name, sim_file_name, jobname, software, version_code, 
-                    license_server, nslots_basic, coretype, ncores, walltime, project_code):
-    job_data = {
-        'isLowPriority': False,
-        'name': jobname,
-        'jobanalyses': [
-            {
-                'envVars': {'CDLMD_LICENSE_FILE': license_server},
-                'useRescaleLicense': 'false',
-                'onDemandLicenseSeller': '',
-                'userDefinedLicenseSettings': {
-                    'featureSets': [{
-                        'name': 'USER_SPECIFIED',
-                        'features': [{'name': 'ccmppower', 'count': '1'}]
-                    }]
-                },
-                'command': ('export STARTING_TIME=$(date +"%Y%m%d_%H%M%S")\n'
-                            'export MPI_FLAVOR=platformmpi\n'
-                            'export user_override_microsoft_infiniband_v4_platformmpi="-TCP"\n'
-                            f'starccm+ -power -np $RESCALE_CORES_PER_SLOT -batch {java_file_name} '
-                            f'-load $(realpath {sim_file_name}) | tee "${{STARTING_TIME}}-${{RESCALE_JOB_ID}}.log"\n'
-                            rf'find . -type d -name "*_Mesh" -o '
-                            rf'-type f \( -name "*_Mesh.sim" -o -name "*_Mesh_ESV_Mode.sim" \) '
-                            rf'-print | zip -s 4g "${{STARTING_TIME}}-${{RESCALE_JOB_ID}}_results.zip" -@'),
-                'analysis': {'code': software, 'version': version_code},
-                'hardware': {
-                    'coresPerSlot': ncores,
-                    'walltime': walltime,
-                    'slots': nslots_basic,
-                    'coreType': coretype,
-                },
-                'inputFiles': [{'id': file_id} for file_id in file_ids],
-            }
-        ],
-        'projectId': project_code,
-    }
-    return job_data    
-
-
-# 통합 작업: HBv3
-def create_job_hbv3(file_ids, java_file_name, sim_file_name, jobname, software, version_code,
-                    license_server, nslots_basic, coretype, ncores, walltime, project_code):
-    job_data = {
-        'isLowPriority': False,
-        'name': jobname,
-        'jobanalyses': [
-            {
-                'envVars': {'CDLMD_LICENSE_FILE': license_server},
-                'useRescaleLicense': 'false',
-                'onDemandLicenseSeller': '',
-                'userDefinedLicenseSettings': {
-                    'featureSets': [{
-                        'name': 'USER_SPECIFIED',
-                        'features': [{'name': 'ccmppower', 'count': '1'}]
-                    }]
-                },
-                'command': ('export STARTING_TIME=$(date +"%Y%m%d_%H%M%S")\n'
-                            'export MPI_FLAVOR=platformmpi\n'
-                            f'starccm+ -power -np $RESCALE_CORES_PER_SLOT -batch {java_file_name} '
-                            f'-load $(realpath {sim_file_name}) | tee "${{STARTING_TIME}}-${{RESCALE_JOB_ID}}.log"\n'
-                            rf'find . -type d -name "*_Mesh" -o '
-                            rf'-type f \( -name "*_Mesh.sim" -o -name "*_Mesh_ESV_Mode.sim" \) '
-                            rf'-print | zip -s 4g "${{STARTING_TIME}}-${{RESCALE_JOB_ID}}_results.zip" -@'),
-                'analysis': {'code': software, 'version': version_code},
-                'hardware': {
-                    'coresPerSlot': ncores,
-                    'walltime': walltime,
-                    'slots': nslots_basic,
-                    'coreType': coretype,
-                },
-                'inputFiles': [{'id': file_id} for file_id in file_ids],
-            }
-        ],
-        'projectId': project_code,
+def register_coretype(name, cores_per_node, mpi_overrides=None):
+    CORETYPES[name] = {'cores_per_node': cores_per_node, 'mpi_overrides': dict(mpi_overrides or {})}
+    compile_command_prefix.cache_clear()
+
+def get_coretype(name):
+    if name not in CORETYPES:
+        raise ValueError(f"Invalid coretype: {name}")
+    return CORETYPES[name]
+
+# 코어타입별 노드당 코어 수
+def coretype_cores():
+    return {name: profile['cores_per_node'] for name, profile in CORETYPES.items()}
+
+
+# 작업 명령 템플릿
+COMMAND_HEADER = ('export STARTING_TIME=$(date +"%Y%m%d_%H%M%S")\n'
+                  'export MPI_FLAVOR=platformmpi\n')
+RESULTS_ARCHIVE = (r'find . -type d -name "*_Mesh" -o '
+                   r'-type f \( -name "*_Mesh.sim" -o -name "*_Mesh_ESV_Mode.sim" \) '
+                   r'-print | zip -s 4g "${STARTING_TIME}-${RESCALE_JOB_ID}_results.zip" -@')
+TEST_RESULTS_ARCHIVE = ('find . -type f -name "*.sim" -print | zip -s 4m "${STARTING_TIME}-${RESCALE_JOB_ID}_results.zip" -@\n'
+                        'rm *.sim')
+LOG_FILE = '"${STARTING_TIME}-${RESCALE_JOB_ID}.log"'
+
+
+@lru_cache(maxsize=None)
+def compile_command_prefix(coretype):
+    overrides = get_coretype(coretype)['mpi_overrides']
+    return COMMAND_HEADER + ''.join(f'export {key}="{value}"\n' for key, value in overrides.items())
+
+
+# 작업 JSON 필수 키 (제출 전 validate_job으로 검증)
+JOB_TEMPLATE_KEYS = ('isLowPriority', 'name', 'jobanalyses', 'projectId')
+ANALYSIS_TEMPLATE_KEYS = ('envVars', 'useRescaleLicense', 'onDemandLicenseSeller', 'command',
+                          'analysis', 'hardware', 'inputFiles')
+
+def validate_job(job_data):
+    problems = [f"Missing key: {key}" for key in JOB_TEMPLATE_KEYS if key not in job_data]
+    for analysis in job_data.get('jobanalyses', ()):
+        problems.extend(f"Missing analysis key: {key}" for key in ANALYSIS_TEMPLATE_KEYS if key not in analysis)
+        hardware = analysis.get('hardware', {})
+        coretype = hardware.get('coreType')
+        if coretype not in CORETYPES:
+            problems.append(f"Invalid coretype: {coretype}")
+        elif int(hardware.get('coresPerSlot', 0)) % CORETYPES[coretype]['cores_per_node']:
+            problems.append(f"Cores ({hardware.get('coresPerSlot')}) is not a multiple of "
+                            f"{CORETYPES[coretype]['cores_per_node']} for {coretype}")
+        if not str(hardware.get('walltime', '')).isdigit():
+            problems.append(f"Invalid walltime: {hardware.get('walltime')}")
+        if not analysis.get('inputFiles'):
+            problems.append("No input files")
+        if not analysis.get('analysis', {}).get('version'):
+            problems.append("No software version")
+    return problems
+
+
+def license_settings(count):
+    return {'featureSets': [{'name': 'USER_SPECIFIED', 'features': [{'name': 'ccmppower', 'count': str(count)}]}]}
+
+
+def assemble_job(jobname, env_vars, command, software, version_code, ncores, walltime, nslots_basic,
+                 coretype, file_ids, project_code, license_count=1):
+    analysis = {
+        'envVars': env_vars,
+        'useRescaleLicense': 'false',
+        'onDemandLicenseSeller': '',
+        'command': command,
+        'analysis': {'code': software, 'version': version_code},
+        'hardware': {
+            'coresPerSlot': ncores,
+            'walltime': walltime,
+            'slots': nslots_basic,
+            'coreType': coretype,
+        },
+        'inputFiles': [{'id': file_id} for file_id in file_ids],
     }
-    return job_data
+    if license_count:
+        analysis['userDefinedLicenseSettings'] = license_settings(license_count)
+    return {'isLowPriority': False, 'name': jobname, 'jobanalyses': [analysis], 'projectId': project_code}
+
 
+# 통합 작업: 코어타입 레지스트리의 설정으로 작업 생성
+#   test=True이면 Rescale internal 테스트 작업 (기존과 같이 MPI 설정 없이 기본 명령만 사용)
+def build_job(coretype, file_ids, java_file_name, sim_file_name, jobname, software, version_code,
+              license_server, nslots_basic, ncores, walltime, project_code, test=False):
+    if test:
+        cdlmd_license_file, lm_project = load_starccmp_config()
+        command = (COMMAND_HEADER + f'starccm+ -power -np $RESCALE_CORES_PER_SLOT -batch run '
+                   f'-load $(realpath {sim_file_name}) | tee {LOG_FILE}\n' + TEST_RESULTS_ARCHIVE)
+        return assemble_job(jobname, {'CDLMD_LICENSE_FILE': cdlmd_license_file, 'LM_PROJECT': lm_project},
+                            command, software, version_code, ncores, walltime, nslots_basic, coretype,
+                            file_ids, project_code, license_count=0)
 
-# Rescale internal: 테스트 작업 실행을 위한 라이선스 정보 획득 함수
+    prefix = compile_command_prefix(coretype)
+    command = (prefix + f'starccm+ -power -np $RESCALE_CORES_PER_SLOT -batch {java_file_name} '
+               f'-load $(realpath {sim_file_name}) | tee {LOG_FILE}\n' + RESULTS_ARCHIVE)
+    return assemble_job(jobname, {'CDLMD_LICENSE_FILE': license_server}, command, software, version_code,
+                        ncores, walltime, nslots_basic, coretype, file_ids, project_code)
+
+
+# Rescale internal: 테스트 작업 실행을 위한 라이선스 정보 획득 함수 (최초 1회만 읽음)
+@lru_cache(maxsize=1)
 def load_starccmp_config():
     # 사용자 홈 디렉토리 경로 확장
     config_file_path = os.path.expanduser("~/.config/rescale/starccmp.json")
@@ -107,35 +132,29 @@ def load_starccmp_config():
 
     return cdlmd_license_file, lm_project
 
-# Rescale internal: 테스트 작업 생성 함수
-def create_job_test(file_ids, java_file_name, sim_file_name, jobname, software, version_code,
-                    license_server, nslots_basic, coretype, ncores, walltime, project_code):
-    cdlmd_license_file, lm_project = load_starccmp_config()
-
-    job_data = {
-        'isLowPriority': False,
-        'name': jobname,
-        'jobanalyses': [
-            {
-                'envVars': {'CDLMD_LICENSE_FILE': cdlmd_license_file, 'LM_PROJECT': lm_project},
-                'useRescaleLicense': 'false',
-                'onDemandLicenseSeller': '',
-                'command': ('export STARTING_TIME=$(date +"%Y%m%d_%H%M%S")\n'
-                            'export MPI_FLAVOR=platformmpi\n'
-                            f'starccm+ -power -np $RESCALE_CORES_PER_SLOT -batch run '
-                            f'-load $(realpath {sim_file_name}) | tee "${{STARTING_TIME}}-${{RESCALE_JOB_ID}}.log"\n'
-                            'find . -type f -name "*.sim" -print | zip -s 4m "${STARTING_TIME}-${RESCALE_JOB_ID}_results.zip" -@\n'
-                            'rm *.sim'),
-                'analysis': {'code': software, 'version': version_code},
-                'hardware': {
-                    'coresPerSlot': ncores,
-                    'walltime': walltime,
-                    'slots': nslots_basic,
-                    'coreType': coretype,
-                },
-                'inputFiles': [{'id': file_id} for file_id in file_ids],
-            }
-        ],
-        'projectId': project_code,
-    }
-    return job_data
\ No newline at end of file
+
+# 묶음 작업: 케이스별 하위 디렉토리에서 코어를 나누어 동시 실행
+#   macro_file_names: 각 케이스 디렉토리로 복사할 .java 파일 (없으면 java_file_name만)
+def create_job_packed(file_ids, cases, java_file_name, jobname, software, version_code,
+                      license_server, coretype, ncores, walltime, project_code, macro_file_names=None):
+    command = compile_command_prefix(coretype)
+    macros = ' '.join(macro_file_names or [java_file_name])
+
+    # machinefile을 케이스별 코어 구간으로 나누어 각 케이스에 할당
+    offset = 0
+    for case_name, sim_file_name, case_cores in cases:
+        command += (f'mkdir -p {case_name} && mv {sim_file_name} {case_name}/ && cp {macros} {case_name}/\n'
+                    f'(cd {case_name} && sed -n "{offset + 1},{offset + case_cores}p" $HOME/machinefile > machinefile && '
+                    f'starccm+ -power -np {case_cores} -machinefile machinefile -batch {java_file_name} '
+                    f'-load $(realpath {sim_file_name}) > {LOG_FILE} 2>&1; {RESULTS_ARCHIVE}) &\n')
+        offset += case_cores
+    command += 'wait'
+
+    return assemble_job(jobname, {'CDLMD_LICENSE_FILE': license_server}, command, software, version_code,
+                        ncores, walltime, '1', coretype, file_ids, project_code, license_count=len(cases))
+
+
+# HBv3
+register_coretype('hematite', 64)
+# HBv4
+register_coretype('natrolite', 96, {'user_override_microsoft_infiniband_v4_platformmpi': '-TCP'})
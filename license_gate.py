@@ -0,0 +1,128 @@
+import re
+import subprocess
+import time
+from abc import ABC, abstractmethod
+from threading import Event, Lock
+from uuid import uuid4
+
+__all__ = ['LicenseChecker', 'LmutilLicenseChecker', 'StaticLicenseChecker', 'LicenseGate']
+
+DEFAULT_FEATURE = 'ccmppower'
+DEFAULT_CACHE_INTERVAL = 30.0 # 초
+DEFAULT_WAIT_INTERVAL = 60.0 # 초
+# 작업이 실행(Executing)된 뒤 STAR-CCM+가 라이선스를 checkout 하여 lmstat에 반영될 때까지 예약을 유지하는 시간
+DEFAULT_CHECKOUT_GRACE = 300.0 # 초
+LMSTAT_PATTERN = re.compile(r'Users of (\S+):\s+\(Total of (\d+) licenses? issued;\s+Total of (\d+) licenses? in use\)')
+
+
+# 라이선스 서버의 사용 가능한 feature 수를 조회하는 인터페이스
+class LicenseChecker(ABC):
+    @abstractmethod
+    def available(self, feature: str):
+        ...
+
+
+# FlexNet lmutil lmstat 출력을 파싱하여 사용 가능한 수를 계산
+class LmutilLicenseChecker(LicenseChecker):
+    def __init__(self, license_server: str, lmutil: str = 'lmutil'):
+        self.license_server = license_server
+        self.lmutil = lmutil
+
+    def available(self, feature: str):
+        command = [self.lmutil, 'lmstat', '-c', self.license_server, '-f', feature]
+        completed_proc = subprocess.run(command, capture_output=True, text=True, timeout=60)
+        completed_proc.check_returncode()
+
+        for name, issued, in_use in LMSTAT_PATTERN.findall(completed_proc.stdout):
+            if name == feature:
+                return int(issued) - int(in_use)
+        raise RuntimeError(f"Feature not found on the license server: {feature}")
+
+
+# 검증용 로컬 대체 checker: 지정한 값을 그대로 반환
+class StaticLicenseChecker(LicenseChecker):
+    def __init__(self, counts: dict):
+        self.counts = counts
+
+    def available(self, feature: str):
+        return self.counts.get(feature, 0)
+
+
+# 제출 전 라이선스 여유를 확인: 조회 결과는 짧은 시간 캐시하고, 내보낸 작업의 토큰은 작업별로 예약
+#   예약은 캐시와 별도로 유지하며, 실행 시작(started) 후 checkout_grace가 지나거나 작업이 끝나면(release) 해제
+class LicenseGate:
+    def __init__(self, checker: LicenseChecker, feature: str = DEFAULT_FEATURE,
+                 cache_interval: float = DEFAULT_CACHE_INTERVAL, checkout_grace: float = DEFAULT_CHECKOUT_GRACE):
+        self.checker = checker
+        self.feature = feature
+        self.cache_interval = cache_interval
+        self.checkout_grace = checkout_grace
+        self.lock = Lock()
+        self.cached = None
+        self.expires = 0.0
+        self.reserved = {}
+        self.release_at = {}
+        self.stopped = Event()
+
+    def refresh(self):
+        # 유예 시간이 지난 예약을 해제한 경우 서버 값을 새로 읽음
+        now = time.monotonic()
+        for key in [key for key, deadline in self.release_at.items() if deadline <= now]:
+            self.drop(key)
+        if self.cached is None or time.monotonic() >= self.expires:
+            self.cached = self.checker.available(self.feature)
+            self.expires = time.monotonic() + self.cache_interval
+
+    def available(self):
+        with self.lock:
+            self.refresh()
+            return self.cached - sum(self.reserved.values())
+
+    # 여유가 있으면 key(없으면 새로 생성)로 토큰을 예약하고 key를 반환
+    def try_acquire(self, tokens: int = 1, key: str = None):
+        with self.lock:
+            self.refresh()
+            if self.cached - sum(self.reserved.values()) < tokens:
+                return None
+            key = key or uuid4().hex
+            self.reserved[key] = self.reserved.get(key, 0) + tokens
+            return key
+
+    # 제출된 작업의 Job ID로 예약을 옮김
+    def assign(self, key: str, job_id: str):
+        with self.lock:
+            if key in self.reserved:
+                self.reserved[job_id] = self.reserved.pop(key)
+
+    # 작업 실행이 시작됨: 라이선스 checkout이 lmstat에 반영될 시간(checkout_grace) 동안 예약 유지
+    def started(self, job_id: str):
+        with self.lock:
+            if job_id in self.reserved:
+                self.release_at.setdefault(job_id, time.monotonic() + self.checkout_grace)
+
+    # 작업이 끝났거나 제출에 실패하면 예약 즉시 해제
+    def release(self, key: str):
+        with self.lock:
+            self.drop(key)
+
+    def drop(self, key: str):
+        self.release_at.pop(key, None)
+        if self.reserved.pop(key, None) is not None:
+            self.expires = 0.0
+
+    # 필요한 토큰이 확보될 때까지 대기 후 예약 key 반환 (stop() 호출 시 None)
+    def wait_for(self, tokens: int = 1, log_signal=None, wait_interval: float = DEFAULT_WAIT_INTERVAL):
+        notified = False
+        while not self.stopped.is_set():
+            key = self.try_acquire(tokens)
+            if key:
+                return key
+            if log_signal and not notified:
+                log_signal.emit(f"Waiting for {tokens} {self.feature} license(s) to be available")
+                notified = True
+            self.stopped.wait(wait_interval)
+        return None
+
+    # 대기 중인 제출을 중단 (프로그램 종료 시)
+    def stop(self):
+        self.stopped.set()
@@ -0,0 +1,116 @@
+import re
+from threading import Lock
+
+__all__ = ['ResidualParser', 'LogTail', 'LiveTailManager']
+
+DEFAULT_MAX_TAILS = 4
+ITERATION_HEADER = re.compile(r'^\s*Iteration\s+')
+COLUMN_SEPARATOR = re.compile(r'\s{2,}')
+
+
+# STAR-CCM+ 출력에서 반복(Iteration) 및 잔차(residual) 행을 점진적으로 파싱
+class ResidualParser:
+    def __init__(self):
+        self.buffer = ''
+        self.columns = None
+        self.last = None
+
+    def feed(self, text: str):
+        rows = []
+        lines = (self.buffer + text).split('\n')
+        # 마지막 줄은 아직 끝나지 않았을 수 있으므로 다음 호출까지 보관
+        self.buffer = lines.pop()
+        for line in lines:
+            if ITERATION_HEADER.match(line):
+                self.columns = COLUMN_SEPARATOR.split(line.strip())[1:]
+                continue
+
+            if self.columns is None:
+                continue
+            values = line.split()
+            if len(values) != len(self.columns) + 1 or not values[0].isdigit():
+                continue
+            try:
+                rows.append((int(values[0]), dict(zip(self.columns, map(float, values[1:])))))
+            except ValueError:
+                continue
+
+        if rows:
+            self.last = rows[-1]
+        return rows
+
+
+# 실행 중인 작업의 로그 파일을 마지막 offset 이후 내용만 가져오는 방식으로 추적
+class LogTail:
+    def __init__(self, rescale_api, job_id: str, run_idx: int = 1):
+        self.rescale_api = rescale_api
+        self.job_id = job_id
+        self.run_idx = run_idx
+        self.log_path = None
+        self.offset = 0
+        self.parser = ResidualParser()
+        self.finished = False
+
+    def find_log_path(self):
+        for item in self.rescale_api.list_run_files(self.job_id, self.run_idx):
+            file_path = item.get('path', '')
+            if file_path.endswith(f'-{self.job_id}.log'):
+                return file_path
+
+    def poll(self):
+        status = self.rescale_api.get_run_status(self.job_id, self.run_idx)
+        if not status or not status.get('dateStarted'):
+            return '', []
+        completed = bool(status.get('dateCompleted'))
+
+        if self.log_path is None:
+            self.log_path = self.find_log_path()
+            if self.log_path is None:
+                self.finished = completed
+                return '', []
+
+        data = self.rescale_api.get_run_file_bytes(self.job_id, self.log_path, self.offset, self.run_idx)
+        self.offset += len(data)
+        text = data.decode('utf-8', errors='replace')
+        self.finished = completed
+        return text, self.parser.feed(text)
+
+
+# 동시에 추적하는 작업 수를 제한
+class LiveTailManager:
+    def __init__(self, rescale_api, max_tails: int = DEFAULT_MAX_TAILS):
+        self.rescale_api = rescale_api
+        self.max_tails = max_tails
+        self.lock = Lock()
+        self.tails = {}
+        self.busy = set()
+
+    def start(self, job_id: str):
+        with self.lock:
+            if job_id in self.tails:
+                return True
+            if len(self.tails) >= self.max_tails:
+                return False
+            self.tails[job_id] = LogTail(self.rescale_api, job_id)
+            return True
+
+    def stop(self, job_id: str):
+        with self.lock:
+            self.busy.discard(self.tails.pop(job_id, None))
+
+    # 이전 요청이 끝나지 않은 작업은 제외하고 이번 주기에 가져올 작업을 예약
+    #   (중지 후 다시 시작한 작업은 새 LogTail이므로 진행 상태를 LogTail 객체별로 관리)
+    def acquire_idle(self):
+        with self.lock:
+            idle = tuple(tail for tail in self.tails.values() if tail not in self.busy)
+            self.busy.update(idle)
+            return idle
+
+    def release(self, log_tail: LogTail):
+        with self.lock:
+            self.busy.discard(log_tail)
+
+    # 중지되었거나 다시 시작되어 교체된 LogTail이 아닌지 확인
+    def is_current(self, log_tail: LogTail):
+        with self.lock:
+            return self.tails.get(log_tail.job_id) is log_tail
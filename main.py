@@ -1,14 +1,29 @@
 import sys
+from os import environ
+from time import perf_counter
+
+STARTUP_TIME = perf_counter()
+
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
 from gui_program import GUIProgram
 
+
+# AUTOPILOT_STARTUP_PROFILE=1 이면 창이 표시될 때까지의 시간을 출력
+def report_startup_time():
+    sys.__stdout__.write(f"Startup time: {perf_counter() - STARTUP_TIME:.3f} s\n")
+    sys.__stdout__.flush()
+
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     gui = GUIProgram()
     gui.show()
+    if environ.get('AUTOPILOT_STARTUP_PROFILE'):
+        QTimer.singleShot(0, report_startup_time)
     sys.exit(app.exec())
 
 """
 History
     v1: First release of AutoPilot-S
-"""
\ No newline at end of file
+"""
@@ -0,0 +1,103 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from urllib import request
+
+__all__ = ['NotificationSource', 'HttpNotificationReceiver', 'LocalEventPoster']
+
+TOKEN_HEADER = 'X-AutoPilot-Token'
+
+
+# 작업 상태 변경 알림 소스: 상태가 바뀌면 callback(job_id, status)를 호출
+class NotificationSource(ABC):
+    def __init__(self, callback):
+        self.callback = callback
+
+    @abstractmethod
+    def start(self):
+        ...
+
+    @abstractmethod
+    def stop(self):
+        ...
+
+    def notify(self, job_id: str, status: str):
+        self.callback(job_id, status)
+
+
+class _NotificationHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        source = self.server.source
+        if source.token and self.headers.get(TOKEN_HEADER) != source.token:
+            self.send_response(403)
+            self.end_headers()
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            event = json.loads(self.rfile.read(length))
+            job_id, status = str(event['jobId']), str(event['status'])
+        except (ValueError, KeyError, TypeError):
+            self.send_response(400)
+            self.end_headers()
+            return
+
+        source.notify(job_id, status)
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+# {"jobId": ..., "status": ...} 형식의 POST 요청을 받는 내장 HTTP 수신기
+class HttpNotificationReceiver(NotificationSource):
+    def __init__(self, callback, host: str = '127.0.0.1', port: int = 0, token: str = ''):
+        super().__init__(callback)
+        self.host = host
+        self.port = port
+        self.token = token
+        self.server = None
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    def start(self):
+        self.server = ThreadingHTTPServer((self.host, self.port), _NotificationHandler)
+        self.server.daemon_threads = True
+        self.server.source = self
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+# 수신기 검증용 로컬 대체 발신기: 임의의 상태 변경 이벤트를 POST
+class LocalEventPoster:
+    def __init__(self, url: str, token: str = ''):
+        self.url = url
+        self.token = token
+
+    def post(self, job_id: str, status: str):
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers[TOKEN_HEADER] = self.token
+        data = json.dumps({'jobId': job_id, 'status': status}).encode('utf-8')
+        with request.urlopen(request.Request(self.url, data=data, headers=headers, method='POST')) as response:
+            return response.status == 204
+
+    def replay(self, events, interval: float = 0.0):
+        ret = True
+        for job_id, status in events:
+            ret &= self.post(job_id, status)
+            time.sleep(interval)
+        return ret
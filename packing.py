@@ -0,0 +1,130 @@
+import hashlib
+import math
+from os import path, makedirs
+
+__all__ = ['macro_digest', 'estimate_core_demand', 'group_compatible_cases', 'pack_cases', 'plan_packed_jobs',
+           'split_packed_results', 'harvest_packed_job']
+
+# .sim 파일 크기 기반 코어 수요 추정치 (약 32MB 당 1코어)
+BYTES_PER_CORE = 33554432 # 32MB
+MIN_CORES_PER_CASE = 4
+# 결과는 입력 파일과 섞이지 않도록 케이스 디렉토리 아래 작업별 하위 폴더에 저장
+RESULTS_DIR_PREFIX = "results_"
+
+
+# .sim 파일 크기로 케이스 하나의 코어 수요를 추정
+def estimate_core_demand(sim_path, capacity):
+    try:
+        size = path.getsize(sim_path)
+    except OSError:
+        return capacity
+
+    demand = max(MIN_CORES_PER_CASE, math.ceil(size / BYTES_PER_CORE))
+    return min(demand, capacity)
+
+
+# 케이스 디렉토리의 .java 파일 전체(이름 및 내용) 해시
+#   묶음 작업은 첫 케이스의 매크로만 업로드하여 모든 케이스에 복사하므로 내용이 같아야 함
+def macro_digest(java_paths):
+    digest = hashlib.sha256()
+    for java_path in sorted(java_paths, key=path.basename):
+        digest.update(path.basename(java_path).encode('utf-8') + b'\0')
+        try:
+            with open(java_path, 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            # 읽을 수 없는 매크로는 다른 케이스와 묶지 않음
+            digest.update(path.abspath(java_path).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+# 같은 버전, 코어타입, 매크로(이름 및 내용)를 사용하는 케이스끼리 묶음
+def group_compatible_cases(cases):
+    groups = {}
+    for case in cases:
+        key = (case['version'], case['coretype'], path.basename(case['java']),
+               macro_digest(case.get('java_paths') or [case['java_path']]))
+        groups.setdefault(key, []).append(case)
+    return groups
+
+
+# First-Fit Decreasing 방식으로 케이스를 용량(capacity) 단위 묶음에 배치
+def pack_cases(cases, capacity):
+    bins = []
+    for case in sorted(cases, key=lambda c: c['cores'], reverse=True):
+        sim_name = path.basename(case['sim'])
+        for packed in bins:
+            used = sum(c['cores'] for c in packed)
+            names = set(path.basename(c['sim']) for c in packed)
+            # 클러스터 작업 디렉토리에서 입력 파일 이름이 겹치지 않아야 함
+            if used + case['cores'] <= capacity and sim_name not in names:
+                packed.append(case)
+                break
+        else:
+            bins.append([case])
+    return bins
+
+
+# 선택된 케이스 전체를 호환 그룹별로 묶어 작업 단위 목록을 생성
+def plan_packed_jobs(cases, capacity):
+    for case in cases:
+        case['cores'] = estimate_core_demand(case['sim_path'], capacity)
+
+    plans = []
+    for group in group_compatible_cases(cases).values():
+        plans.extend(pack_cases(group, capacity))
+    return plans
+
+
+# 결과 파일을 케이스 디렉토리(relativePath 첫 경로) 기준으로 분류
+def split_packed_results(files, case_names):
+    ret = {name: [] for name in case_names}
+    for file in files:
+        relative_path = file.get('relativePath') or file['name']
+        case_name = relative_path.replace('\\', '/').split('/')[0]
+        if case_name in ret:
+            ret[case_name].append(file)
+    return ret
+
+
+# 출력 목록의 파일이 업로드한 입력 파일과 같은 내용인지 확인 (로컬 파일 인덱스의 해시와 fileChecksums 비교)
+def is_unchanged_input(file, input_paths, file_index):
+    for input_path in input_paths:
+        entry = file_index.get(input_path) if file_index else None
+        if entry is None or path.basename(input_path) != file['name']:
+            continue
+        for checksum in file.get('fileChecksums') or ():
+            algorithm = checksum.get('hashFunction', '').lower().replace('-', '')
+            if algorithm == entry['algorithm'] and checksum.get('fileHash', '').lower() == entry['digest']:
+                return True
+    return False
+
+
+# 묶음 작업의 결과를 각 케이스 디렉토리의 작업별 결과 폴더로 내려받음
+#   case_inputs: 케이스별 업로드한 입력 파일 경로 (내용이 바뀌지 않은 채 출력 목록에 다시 나타난 입력만 제외)
+def harvest_packed_job(rescale_api, job_id, case_dirs, case_inputs=None, transfer_manager=None, file_index=None):
+    files = rescale_api.get_all_files(job_id)
+    if files is None:
+        return False
+
+    file_index = file_index or (transfer_manager.file_index if transfer_manager else None)
+    ret = True
+    item_ids = []
+    for case_name, case_files in split_packed_results(files, case_dirs.keys()).items():
+        download_path = path.join(case_dirs[case_name], f"{RESULTS_DIR_PREFIX}{job_id}")
+        makedirs(download_path, exist_ok=True)
+        input_paths = (case_inputs or {}).get(case_name, ())
+        for file in case_files:
+            if is_unchanged_input(file, input_paths, file_index):
+                continue
+            if transfer_manager:
+                item_ids.append(transfer_manager.download(file['id'], download_path, file['name'], file['decryptedSize'],
+                                                          file.get('fileChecksums')))
+            else:
+                ret &= bool(rescale_api.download_file(file['id'], download_path, file['name'], file['decryptedSize'],
+                                                      file.get('fileChecksums')))
+
+    for item_id in item_ids:
+        ret &= bool(transfer_manager.wait(item_id))
+    return ret
@@ -0,0 +1,79 @@
+import heapq
+from itertools import count
+from threading import Lock
+
+__all__ = ['SubmissionScheduler', 'PRIORITY_LEVELS']
+
+# 사용자 우선순위 (값이 클수록 먼저 제출)
+PRIORITY_LEVELS = {"높음": 3, "보통": 2, "낮음": 1}
+DEFAULT_PRIORITY = PRIORITY_LEVELS["보통"]
+
+
+class SubmissionScheduler:
+    def __init__(self, threadpool, core_quota: int = 0):
+        self.threadpool = threadpool
+        self.core_quota = core_quota
+        self.lock = Lock()
+        self.pending = []
+        self.in_flight = {}
+        self.running = {}
+        self.sequence = count()
+
+    # 제출 대기열에 작업 추가: 우선순위가 높고 규모가 작은 작업부터 제출
+    #   여러 작업을 한 번에 추가할 때는 dispatch=False로 모두 넣은 뒤 dispatch()를 한 번 호출
+    def enqueue(self, worker, cores: int, priority: int = DEFAULT_PRIORITY, size: int = 0, dispatch: bool = True):
+        worker.priority = priority
+        seq = next(self.sequence)
+        worker.signals.result.connect(lambda result, s=seq: self.job_submitted(s, result))
+        worker.signals.error.connect(lambda error, s=seq: self.job_failed(s))
+        with self.lock:
+            heapq.heappush(self.pending, (-priority, size, seq, cores, worker))
+        if dispatch:
+            self.dispatch()
+
+    def projected_cores(self):
+        return sum(self.in_flight.values()) + sum(self.running.values())
+
+    # 제출 스레드가 비어 있을 때 대기열에서 한 작업씩 꺼내 제출
+    #   (스레드 풀에 미리 넣으면 FIFO 순서로 실행되어 우선순위가 적용되지 않음)
+    def dispatch(self):
+        with self.lock:
+            if self.in_flight or not self.pending:
+                return 0
+            _, _, seq, cores, worker = self.pending[0]
+            used = self.projected_cores()
+            # 상한보다 큰 단일 작업은 다른 작업이 모두 끝난 뒤 단독으로 제출
+            if self.core_quota and used + cores > self.core_quota and used:
+                return 0
+            heapq.heappop(self.pending)
+            self.in_flight[seq] = cores
+
+        self.threadpool.start(worker)
+        return 1
+
+    def job_submitted(self, seq, result):
+        job_id = result[0] if isinstance(result, tuple) else result
+        with self.lock:
+            cores = self.in_flight.pop(seq, 0)
+            self.running[job_id] = cores
+        self.dispatch()
+
+    def job_failed(self, seq):
+        with self.lock:
+            released = self.in_flight.pop(seq, None) is not None
+        if released:
+            self.dispatch()
+
+    def job_completed(self, job_id):
+        with self.lock:
+            released = self.running.pop(job_id, None) is not None
+        if released:
+            self.dispatch()
+
+    def running_job_ids(self):
+        with self.lock:
+            return tuple(self.running.keys())
+
+    def pending_count(self):
+        with self.lock:
+            return len(self.pending)
@@ -0,0 +1,167 @@
+import re
+from datetime import datetime
+from os import path
+from threading import Lock
+
+__all__ = ['RuntimeHistory', 'read_cell_count', 'estimate_work', 'fit_runtime_model', 'choose_size']
+
+HISTORY_FILE = "runtime_history.csv"
+HISTORY_FIELDS = ('job_id', 'coretype', 'ncores', 'sim_size', 'cells', 'runtime')
+FAILED_RUN = 'failed' # 정상 종료하지 않은 run의 runtime 값
+
+# .sim 파일 크기로 셀 수를 추정할 때 사용하는 값 (셀 1개당 약 1.5KB)
+BYTES_PER_CELL = 1536
+HEADER_READ_SIZE = 1048576 # 1MB
+CELL_COUNT_PATTERN = re.compile(rb'(?:[Cc]ells?\s*[:=]\s*(\d+)|(\d+)\s+[Cc]ells)')
+
+# 실행 시간 모델 T(c) = a * work / c + b + d * c 의 기본 계수 (이력이 부족한 경우)
+DEFAULT_MODEL = (1.0e-2, 300.0, 2.0)
+MIN_HISTORY_SAMPLES = 3
+MAX_NODE_COUNT = 16
+DEFAULT_EFFICIENCY_FLOOR = 0.7
+
+
+# .sim 파일 헤더에서 셀 수를 읽음 (찾지 못하면 None)
+def read_cell_count(sim_path):
+    try:
+        with open(sim_path, 'rb') as fd:
+            header = fd.read(HEADER_READ_SIZE)
+    except OSError:
+        return None
+
+    match = CELL_COUNT_PATTERN.search(header)
+    if match:
+        return int(match.group(1) or match.group(2))
+
+
+# 케이스의 작업량(셀 수)을 추정: 헤더의 셀 수를 우선하고 없으면 파일 크기로 환산
+def estimate_work(sim_size, cells=None):
+    if cells:
+        return float(cells)
+    return max(1.0, sim_size / BYTES_PER_CELL)
+
+
+# 3x3 연립방정식 풀이 (가우스 소거법)
+def _solve3(matrix, vector):
+    m = [row[:] + [v] for row, v in zip(matrix, vector)]
+    for i in range(3):
+        pivot = max(range(i, 3), key=lambda r: abs(m[r][i]))
+        if abs(m[pivot][i]) < 1e-12:
+            return None
+        m[i], m[pivot] = m[pivot], m[i]
+        for r in range(3):
+            if r != i:
+                factor = m[r][i] / m[i][i]
+                m[r] = [x - factor * y for x, y in zip(m[r], m[i])]
+    return tuple(m[i][3] / m[i][i] for i in range(3))
+
+
+# 과거 실행 이력으로 T(c) = a * work / c + b + d * c 모델을 최소제곱 적합
+def fit_runtime_model(samples):
+    if len(samples) < MIN_HISTORY_SAMPLES or len(set(ncores for _, ncores, _ in samples)) < 2:
+        return DEFAULT_MODEL
+
+    ata = [[0.0] * 3 for _ in range(3)]
+    atb = [0.0] * 3
+    for work, ncores, runtime in samples:
+        row = (work / ncores, 1.0, float(ncores))
+        for i in range(3):
+            atb[i] += row[i] * runtime
+            for j in range(3):
+                ata[i][j] += row[i] * row[j]
+
+    model = _solve3(ata, atb)
+    # 물리적으로 의미 없는 계수가 나오면 기본 모델 사용
+    if model is None or model[0] <= 0 or model[2] < 0:
+        return DEFAULT_MODEL
+    return model
+
+
+def predict_runtime(model, work, ncores):
+    a, b, d = model
+    return a * work / ncores + max(b, 0.0) + d * ncores
+
+
+# 효율 하한을 넘지 않는 범위에서 결과까지의 시간이 가장 짧은 코어타입/노드 수를 선택
+def choose_size(work, models, coretypes, efficiency_floor=DEFAULT_EFFICIENCY_FLOOR):
+    best = None
+    for coretype, cores_per_node in coretypes.items():
+        model = models.get(coretype, DEFAULT_MODEL)
+        base_time = predict_runtime(model, work, cores_per_node)
+        for node_count in range(1, MAX_NODE_COUNT + 1):
+            runtime = predict_runtime(model, work, node_count * cores_per_node)
+            if base_time / (node_count * runtime) < efficiency_floor:
+                break
+            if best is None or runtime < best[2]:
+                best = (coretype, node_count, runtime)
+    return best
+
+
+class RuntimeHistory:
+    def __init__(self, history_file: str = HISTORY_FILE):
+        self.history_file = history_file
+        self.lock = Lock()
+        self.records = self.load()
+
+    def load(self):
+        if not path.exists(self.history_file):
+            return []
+        import csv
+        with open(self.history_file, 'r', encoding='utf-8', newline='') as f:
+            return list(csv.DictReader(f))
+
+    def save(self):
+        import csv
+        with open(self.history_file, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=HISTORY_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.records)
+
+    # 제출된 작업을 실행 시간 미확정 상태로 기록
+    def record_submission(self, job_id, coretype, ncores, sim_size, cells=None):
+        with self.lock:
+            self.records.append({'job_id': job_id, 'coretype': coretype, 'ncores': ncores,
+                                 'sim_size': sim_size, 'cells': cells or '', 'runtime': ''})
+            self.save()
+
+    # 완료된 작업의 실행 시간을 Rescale run 정보에서 채움
+    #   조회에 실패한 기록(삭제된 작업, 아직 시작하지 않은 run 등)은 건너뛰고 다음 refresh에서 다시 확인
+    #   정상 종료하지 않은 run(exitCode가 0이 아님)은 모델에 쓰지 않도록 FAILED_RUN으로 표시
+    def refresh(self, rescale_api):
+        with self.lock:
+            pending = [record for record in self.records if not record['runtime']]
+
+        updated = False
+        for record in pending:
+            try:
+                status = rescale_api.get_run_status(record['job_id'])
+            except Exception:
+                continue
+            if not (status and status.get('dateStarted') and status.get('dateCompleted')):
+                continue
+
+            if status.get('exitCode') not in (None, 0):
+                runtime = FAILED_RUN
+            else:
+                started = datetime.fromisoformat(status['dateStarted'].replace('Z', '+00:00'))
+                completed = datetime.fromisoformat(status['dateCompleted'].replace('Z', '+00:00'))
+                runtime = (completed - started).total_seconds()
+            with self.lock:
+                record['runtime'] = runtime
+            updated = True
+
+        if updated:
+            with self.lock:
+                self.save()
+        return updated
+
+    # 코어타입별 실행 시간 모델
+    def models(self):
+        samples = {}
+        with self.lock:
+            for record in self.records:
+                if record['runtime'] and record['runtime'] != FAILED_RUN:
+                    work = estimate_work(float(record['sim_size']), record['cells'] and int(record['cells']))
+                    samples.setdefault(record['coretype'], []).append(
+                        (work, int(record['ncores']), float(record['runtime'])))
+        return {coretype: fit_runtime_model(values) for coretype, values in samples.items()}
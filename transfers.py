@@ -0,0 +1,276 @@
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from itertools import count
+from os import path
+from threading import Condition, Lock, Thread
+from uuid import uuid4
+from api import expected_checksum
+from file_index import FileIndex, DEFAULT_ALGORITHM
+
+__all__ = ['BandwidthLimiter', 'TransferManager', 'parse_bandwidth_schedule']
+
+TRANSFER_QUEUE_FILE = "transfer_queue.json"
+SMALL_TRANSFER_SIZE = 8388608 # 8MB
+PRIORITY_EXTENSIONS = ('.java',)
+SAVE_INTERVAL = 5.0 # 초
+
+QUEUED, RUNNING, PAUSED, DONE, FAILED, CANCELLED = 'queued', 'running', 'paused', 'done', 'failed', 'cancelled'
+# 재시작 전에 끝나지 않은 업로드: 제출할 작업 정보가 남아 있지 않으므로 재개하지 않음
+ORPHANED = 'orphaned'
+FINISHED_STATES = (DONE, FAILED, CANCELLED, ORPHANED)
+ORPHANED_MESSAGE = '프로그램 재시작으로 제출이 중단됨 (해당 디렉토리를 다시 제출하세요)'
+
+
+class TransferPaused(Exception):
+    pass
+
+
+class TransferCancelled(Exception):
+    pass
+
+
+# {"HH:MM-HH:MM": bytes/sec} 형식의 시간대별 대역폭 설정을 (시작 분, 종료 분, 제한) 목록으로 변환
+def parse_bandwidth_schedule(schedule: dict):
+    ret = []
+    for window, limit in schedule.items():
+        start, end = window.split('-')
+        to_minute = lambda text: int(text.split(':')[0]) * 60 + int(text.split(':')[1])
+        ret.append((to_minute(start), to_minute(end), int(limit)))
+    return ret
+
+
+# 전체 대량 전송에 공통으로 적용하는 토큰 버킷 방식의 대역폭 제한 (0은 무제한)
+class BandwidthLimiter:
+    def __init__(self, default_limit: int = 0, schedule=()):
+        self.default_limit = default_limit
+        self.schedule = list(schedule)
+        self.lock = Lock()
+        self.allowance = 0.0
+        self.last = time.monotonic()
+
+    def current_limit(self, now=None):
+        now = now or datetime.now()
+        minute = now.hour * 60 + now.minute
+        for start, end, limit in self.schedule:
+            # 자정을 넘는 구간(예: 22:00-06:00) 포함
+            if start <= minute < end or (end < start and (minute >= start or minute < end)):
+                return limit
+        return self.default_limit
+
+    def consume(self, nbytes: int):
+        limit = self.current_limit()
+        if not limit:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            self.allowance = min(float(limit), self.allowance + (now - self.last) * limit) - nbytes
+            self.last = now
+            delay = -self.allowance / limit if self.allowance < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+
+
+# 업로드/다운로드를 저장 가능한 대기열 항목으로 관리 (일시 정지, 재개, 취소 지원)
+#   - .java 및 작은 파일은 별도 대기열에서 대역폭 제한 없이 먼저 처리
+#   - 업로드는 중간부터 이어서 보낼 수 없으므로 재개 시 처음부터 다시 전송
+#   - 전송 중 계산한 해시로 업로드/다운로드를 검증하고 로컬 파일 인덱스에 기록
+#   - 인덱스에 기록된 파일이 바뀌지 않았고 Rescale에 남아 있으면 다시 업로드하지 않음
+class TransferManager:
+    def __init__(self, rescale_api, queue_file: str = TRANSFER_QUEUE_FILE, limiter: BandwidthLimiter = None,
+                 file_index: FileIndex = None):
+        self.rescale_api = rescale_api
+        self.file_index = file_index or FileIndex()
+        self.queue_file = queue_file
+        self.limiter = limiter or BandwidthLimiter()
+        self.condition = Condition()
+        self.sequence = count()
+        self.items = self.load()
+        self.last_saved = 0.0
+        self.lanes = []
+
+    def load(self):
+        if not path.exists(self.queue_file):
+            return {}
+        with open(self.queue_file, 'r', encoding='utf-8') as f:
+            items = json.load(f)
+
+        # 이전 실행에서 진행 중이던 다운로드는 다시 대기열로, 끝나지 않은 업로드는 중단 표시
+        for item in items:
+            if item['kind'] == 'upload' and item['state'] in (QUEUED, RUNNING, PAUSED):
+                item['state'] = ORPHANED
+                item['error'] = ORPHANED_MESSAGE
+            elif item['state'] == RUNNING:
+                item['state'] = QUEUED
+            item['seq'] = next(self.sequence)
+        return {item['id']: item for item in items}
+
+    def save(self, force: bool = True):
+        if not force and time.monotonic() - self.last_saved < SAVE_INTERVAL:
+            return
+        with open(self.queue_file, 'w', encoding='utf-8') as f:
+            json.dump(list(self.items.values()), f, indent=4)
+        self.last_saved = time.monotonic()
+
+    def start(self):
+        if self.lanes:
+            return
+        self.lanes = [Thread(target=self.run_lane, args=(interactive,), daemon=True) for interactive in (True, False)]
+        for lane in self.lanes:
+            lane.start()
+
+    def is_interactive(self, item):
+        return item['size'] <= SMALL_TRANSFER_SIZE or item['name'].endswith(PRIORITY_EXTENSIONS)
+
+    def enqueue(self, kind: str, name: str, size: int, args: dict, state: str = QUEUED, result=None):
+        item = {'id': uuid4().hex, 'seq': next(self.sequence), 'kind': kind, 'name': name, 'size': size,
+                'args': args, 'state': state, 'transferred': size if state == DONE else 0, 'result': result,
+                'error': ''}
+        with self.condition:
+            self.items[item['id']] = item
+            self.save()
+            self.condition.notify_all()
+        self.start()
+        return item['id']
+
+    def upload(self, file_name: str):
+        file_id = self.uploaded_file_id(file_name)
+        if file_id:
+            return self.enqueue('upload', file_name, path.getsize(file_name), {'file_name': file_name}, DONE, file_id)
+        return self.enqueue('upload', file_name, path.getsize(file_name), {'file_name': file_name})
+
+    # 기록 이후 바뀌지 않은 파일이 Rescale에 같은 해시로 남아 있으면 기존 파일 ID 반환 (다시 해시/업로드하지 않음)
+    def uploaded_file_id(self, file_name: str):
+        entry = self.file_index.get(file_name)
+        if not entry or not entry.get('file_id'):
+            return None
+        try:
+            info = self.rescale_api.get_file_info(entry['file_id'])
+        except Exception:
+            return None
+
+        algorithm, expected = expected_checksum((info or {}).get('fileChecksums'))
+        if algorithm == entry['algorithm'] and expected == entry['digest']:
+            return entry['file_id']
+
+    def download(self, file_id: int, download_path: str, file_name: str, download_size: int, checksums=None):
+        return self.enqueue('download', path.join(download_path, file_name), download_size,
+                            {'file_id': file_id, 'download_path': download_path, 'file_name': file_name,
+                             'checksums': checksums})
+
+    # 완료될 때까지 대기 후 결과 반환 (실패/취소 시 None)
+    def wait(self, item_id: str):
+        with self.condition:
+            self.condition.wait_for(lambda: self.items[item_id]['state'] in FINISHED_STATES)
+            item = self.items[item_id]
+            return item['result'] if item['state'] == DONE else None
+
+    def upload_files(self, file_names: list[str]):
+        item_ids = [self.upload(file_name) for file_name in file_names]
+        ret = tuple(self.wait(item_id) for item_id in item_ids)
+        if all(ret):
+            return ret
+
+    def set_state(self, item_id: str, state: str, from_states):
+        with self.condition:
+            item = self.items.get(item_id)
+            if item is None or item['state'] not in from_states:
+                return False
+            item['state'] = state
+            self.save()
+            self.condition.notify_all()
+            return True
+
+    def pause(self, item_id: str):
+        return self.set_state(item_id, PAUSED, (QUEUED, RUNNING))
+
+    def resume(self, item_id: str):
+        return self.set_state(item_id, QUEUED, (PAUSED, FAILED))
+
+    def cancel(self, item_id: str):
+        return self.set_state(item_id, CANCELLED, (QUEUED, RUNNING, PAUSED, FAILED))
+
+    def remove_finished(self):
+        with self.condition:
+            for item_id in [k for k, v in self.items.items() if v['state'] in (DONE, CANCELLED, ORPHANED)]:
+                del self.items[item_id]
+            self.save()
+
+    def orphaned_uploads(self):
+        with self.condition:
+            return [item['name'] for item in self.items.values() if item['state'] == ORPHANED]
+
+    def snapshot(self):
+        with self.condition:
+            return [dict(item) for item in sorted(self.items.values(), key=lambda i: i['seq'])]
+
+    def next_item(self, interactive: bool):
+        queued = [item for item in self.items.values()
+                  if item['state'] == QUEUED and self.is_interactive(item) == interactive]
+        return min(queued, key=lambda i: i['seq']) if queued else None
+
+    def run_lane(self, interactive: bool):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.next_item(interactive) is not None)
+                item = self.next_item(interactive)
+                item['state'] = RUNNING
+                item['error'] = ''
+                self.save()
+
+            state, result, error = self.transfer(item, interactive)
+            with self.condition:
+                if item['state'] == RUNNING:
+                    item['state'] = state
+                item['result'] = result
+                item['error'] = error
+                # 취소되었거나 검증에 실패한 다운로드는 받은 부분을 삭제
+                if item['state'] in (CANCELLED, FAILED) and item['kind'] == 'download' and path.exists(item['name']):
+                    os.remove(item['name'])
+                    item['transferred'] = 0
+                self.save()
+                self.condition.notify_all()
+
+    def transfer(self, item, interactive: bool):
+        # 받은 조각은 이미 파일에 기록되었으므로 일시 정지/취소 확인 전에 먼저 반영
+        def progress(nbytes):
+            item['transferred'] += nbytes
+            if item['state'] == PAUSED:
+                raise TransferPaused()
+            if item['state'] == CANCELLED:
+                raise TransferCancelled()
+            if not interactive:
+                self.limiter.consume(nbytes)
+            with self.condition:
+                self.save(force=False)
+
+        try:
+            if item['kind'] == 'upload':
+                item['transferred'] = 0
+                digest = hashlib.new(DEFAULT_ALGORITHM)
+                result = self.rescale_api.api_base_upload(item['args']['file_name'], True, progress, digest)
+            else:
+                # 이전에 받은 부분이 있으면 파일 크기부터 이어서 다운로드 (받은 부분은 다시 해시하여 검증)
+                #   transferred는 주기적으로만 저장되므로 재시작 후에는 파일 크기를 기준으로 함
+                offset = path.getsize(item['name']) if path.exists(item['name']) else 0
+                offset = offset if offset < item['size'] else 0
+                item['transferred'] = offset
+                args = item['args']
+                algorithm, _ = expected_checksum(args.get('checksums'))
+                digest = hashlib.new(algorithm or DEFAULT_ALGORITHM)
+                result = self.rescale_api.api_base_download(args['file_id'], args['download_path'], args['file_name'],
+                                                            item['size'], offset, progress, args.get('checksums'), digest)
+            if not result:
+                return FAILED, None, 'Size or checksum mismatch'
+
+            item['digest'] = digest.hexdigest()
+            self.file_index.record(item['name'], digest.name, item['digest'],
+                                   result if item['kind'] == 'upload' else item['args']['file_id'])
+            return DONE, result, ''
+        except (TransferPaused, TransferCancelled):
+            return item['state'], None, ''
+        except Exception as e:
+            return FAILED, None, str(e)
@@ -1,4 +1,5 @@
 import jobs_starccmp
+from os import path
 from PyQt6.QtCore import QRunnable, pyqtSignal, QObject
 from api import *
 
@@ -12,9 +13,48 @@ class WorkerSignals(QObject):
 	progress = pyqtSignal(int)
 
 
+# 제출된 작업에 사용자 우선순위 적용
+def prioritize(rescale_api, config, job_id, priority, log_signal):
+	organization_code = config.get('organization_code')
+	if not organization_code or priority is None:
+		return
+
+	try:
+		if rescale_api.prioritize_job(organization_code, job_id, priority):
+			log_signal.emit(f'The job is prioritized (Job ID: {job_id}, Priority: {priority})')
+	except Exception as e:
+		log_signal.emit(f"Error in job prioritization: {e}")
+
+
+# 라이선스가 확보될 때까지 작업 생성을 보류하고 예약 key 반환 (조회 실패 시 그대로 진행)
+def wait_for_license(license_gate, tokens, log_signal):
+	if license_gate is None:
+		return None
+
+	try:
+		key = license_gate.wait_for(tokens, log_signal)
+	except Exception as e:
+		log_signal.emit(f"Error in license check, submitting without the check: {e}")
+		return None
+	if key is None:
+		raise RuntimeError("Waiting for licenses is cancelled")
+	return key
+
+
+# 제출된 작업에 예약을 연결하거나, 제출에 실패하면 예약 해제
+def settle_license(license_gate, key, job_id=None):
+	if license_gate is None or key is None:
+		return
+	if job_id:
+		license_gate.assign(key, job_id)
+	else:
+		license_gate.release(key)
+
+
 class SubmitWorker(QRunnable):
 	def __init__(self, job_type, config, version, coretype, ncores, walltime,
-				file_paths: list[str], java_file, sim_file, log_signal):
+				file_paths: list[str], java_file, sim_file, log_signal, rescale_api=None,
+				license_gate=None, transfer_manager=None):
 		super().__init__()
 		self.job_type = job_type
 		self.config = config
@@ -27,7 +67,10 @@ class SubmitWorker(QRunnable):
 		self.sim_file_name = sim_file
 		self.signals = WorkerSignals()
 		self.log_signal = log_signal
-		self.rescale_api = RescaleAPI(config['apibaseurl'], config['apikey'])
+		self.rescale_api = rescale_api or RescaleAPI(config['apibaseurl'], config['apikey'])
+		self.priority = None
+		self.license_gate = license_gate
+		self.transfer_manager = transfer_manager
 
 	def run(self):
 		file_ids = self.upload_files()
@@ -41,6 +84,8 @@ class SubmitWorker(QRunnable):
 	def upload_files(self):
 		try:
 			self.log_signal.emit(f"Uploading {self.file_paths[0]} and related files")
+			if self.transfer_manager:
+				return self.transfer_manager.upload_files(self.file_paths)
 			return self.rescale_api.upload_files(self.file_paths, get_file_id=True)
 		except Exception as e:
 			self.log_signal.emit(f"Error during upload: {str(e)}")
@@ -50,23 +95,19 @@ class SubmitWorker(QRunnable):
 		coretype = self.coretype
 		sim_file_name = self.sim_file_name
 
+		license_key = None
 		try:
-			if TEST_MODE:
-				submit_func = jobs_starccmp.create_job_test
-			else:
-				if coretype == 'hematite':
-					submit_func = jobs_starccmp.create_job_hbv3
-				elif coretype == 'natrolite':
-					submit_func = jobs_starccmp.create_job_hbv4
-				else:
-					raise ValueError(f"Invalid coretype: {coretype}")
+			jobs_starccmp.get_coretype(coretype)
+
+			# Wait for license
+			license_key = wait_for_license(self.license_gate, 1, self.log_signal)
 
 			# Create job
 			self.log_signal.emit(f'Submitting job {sim_file_name}')
 			jobname = sim_file_name.split('.')[0]
-			job_data = submit_func(file_ids, self.java_file_name, sim_file_name, jobname,
+			job_data = jobs_starccmp.build_job(coretype, file_ids, self.java_file_name, sim_file_name, jobname,
 									self.config['software'], self.version, self.config['license_server'],
-									"1", coretype, self.ncores, self.walltime, self.config['project_code'])
+									"1", self.ncores, self.walltime, self.config['project_code'], test=TEST_MODE)
 			job_id = self.rescale_api.create_job(job_data)
 
 			# Assign project (Test)
@@ -79,8 +120,164 @@ class SubmitWorker(QRunnable):
 				raise RuntimeError(f"Failed to submit the job: {job_id}")
 
 
+			settle_license(self.license_gate, license_key, job_id)
 			self.log_signal.emit(f'The job is submitted successfully (Job ID: {job_id})')
+			prioritize(self.rescale_api, self.config, job_id, self.priority, self.log_signal)
+			self.signals.result.emit(job_id)
+			self.signals.finished.emit(f"Done to submit the job(JOB ID: {job_id}).")
+		except Exception as e:
+			settle_license(self.license_gate, license_key)
+			self.log_signal.emit(f"Error in job submission: {e}")
+			self.signals.error.emit((type(e).__name__, f"Error in submit_job: {str(e)}"))
+
+class PackedSubmitWorker(QRunnable):
+	def __init__(self, config, version, coretype, ncores, walltime, cases: list[dict], log_signal,
+				rescale_api=None, license_gate=None, transfer_manager=None):
+		super().__init__()
+		self.config = config
+		self.version = version
+		self.coretype = coretype
+		self.ncores = ncores
+		self.walltime = walltime
+		self.cases = cases
+		self.java_file_name = path.basename(cases[0]['java'])
+		# 묶인 케이스는 매크로 내용이 같으므로 첫 케이스의 .java 파일 전체를 업로드
+		self.java_paths = cases[0].get('java_paths') or [cases[0]['java_path']]
+		self.macro_file_names = [path.basename(java_path) for java_path in self.java_paths]
+		self.file_paths = self.java_paths + [case['sim_path'] for case in cases]
+		self.signals = WorkerSignals()
+		self.log_signal = log_signal
+		self.rescale_api = rescale_api or RescaleAPI(config['apibaseurl'], config['apikey'])
+		self.priority = None
+		self.license_gate = license_gate
+		self.transfer_manager = transfer_manager
+
+	def run(self):
+		case_names = ', '.join(case['dir'] for case in self.cases)
+		try:
+			self.log_signal.emit(f"Uploading packed cases: {case_names}")
+			if self.transfer_manager:
+				file_ids = self.transfer_manager.upload_files(self.file_paths)
+			else:
+				file_ids = self.rescale_api.upload_files(self.file_paths, get_file_id=True)
+		except Exception as e:
+			self.log_signal.emit(f"Error during upload: {str(e)}")
+			self.signals.error.emit((type(e).__name__, str(e)))
+			return
+
+		if not file_ids:
+			self.log_signal.emit(f"Upload failed: {case_names}")
+			self.signals.error.emit(("UploadError", f"Failed to upload packed cases: {case_names}"))
+			return
+
+		license_key = None
+		try:
+			license_key = wait_for_license(self.license_gate, len(self.cases), self.log_signal)
+			self.log_signal.emit(f'Submitting packed job ({len(self.cases)} cases): {case_names}')
+			jobname = f"{path.basename(self.cases[0]['sim']).split('.')[0]}_x{len(self.cases)}"
+			job_data = jobs_starccmp.create_job_packed(
+				file_ids, [(case['dir'], path.basename(case['sim']), case['cores']) for case in self.cases],
+				self.java_file_name, jobname, self.config['software'], self.version,
+				self.config['license_server'], self.coretype, self.ncores, self.walltime,
+				self.config['project_code'], self.macro_file_names)
+			job_id = self.rescale_api.create_job(job_data)
+
+			if not self.rescale_api.submit_job(job_id):
+				raise RuntimeError(f"Failed to submit the job: {job_id}")
+
+			settle_license(self.license_gate, license_key, job_id)
+			self.log_signal.emit(f'The packed job is submitted successfully (Job ID: {job_id})')
+			prioritize(self.rescale_api, self.config, job_id, self.priority, self.log_signal)
+			self.signals.result.emit((job_id,
+									  {case['dir']: path.join(case['dirname'], case['dir']) for case in self.cases},
+									  {case['dir']: (case['sim_path'], *self.java_paths) for case in self.cases}))
 			self.signals.finished.emit(f"Done to submit the job(JOB ID: {job_id}).")
 		except Exception as e:
+			settle_license(self.license_gate, license_key)
 			self.log_signal.emit(f"Error in job submission: {e}")
-			self.signals.error.emit((type(e).__name__, f"Error in submit_job: {str(e)}"))
\ No newline at end of file
+			self.signals.error.emit((type(e).__name__, f"Error in submit_job: {str(e)}"))
+
+
+class HarvestWorker(QRunnable):
+	def __init__(self, rescale_api, job_id, case_dirs: dict, case_inputs: dict, log_signal, transfer_manager=None):
+		super().__init__()
+		self.rescale_api = rescale_api
+		self.case_inputs = case_inputs
+		self.transfer_manager = transfer_manager
+		self.job_id = job_id
+		self.case_dirs = case_dirs
+		self.signals = WorkerSignals()
+		self.log_signal = log_signal
+
+	def run(self):
+		import packing
+
+		try:
+			if not self.rescale_api.is_job_completed(self.job_id):
+				self.log_signal.emit(f'The job is not completed yet (Job ID: {self.job_id})')
+				return
+
+			self.log_signal.emit(f'Downloading results of the packed job (Job ID: {self.job_id})')
+			if not packing.harvest_packed_job(self.rescale_api, self.job_id, self.case_dirs, self.case_inputs,
+												   self.transfer_manager):
+				raise RuntimeError(f"Failed to download results: {self.job_id}")
+
+			self.log_signal.emit(f'Results are split into {len(self.case_dirs)} directories (Job ID: {self.job_id})')
+			self.signals.finished.emit(self.job_id)
+		except Exception as e:
+			self.log_signal.emit(f"Error in harvest: {e}")
+			self.signals.error.emit((type(e).__name__, f"Error in harvest: {str(e)}"))
+
+
+class HistoryRefreshWorker(QRunnable):
+	def __init__(self, rescale_api, runtime_history, log_signal):
+		super().__init__()
+		self.rescale_api = rescale_api
+		self.runtime_history = runtime_history
+		self.signals = WorkerSignals()
+		self.log_signal = log_signal
+
+	def run(self):
+		try:
+			if self.runtime_history.refresh(self.rescale_api):
+				self.log_signal.emit('Runtime history is updated')
+		except Exception as e:
+			self.log_signal.emit(f"Error in runtime history refresh: {e}")
+
+
+class StatusPollWorker(QRunnable):
+	def __init__(self, rescale_api, job_ids, log_signal):
+		super().__init__()
+		self.rescale_api = rescale_api
+		self.job_ids = job_ids
+		self.signals = WorkerSignals()
+		self.log_signal = log_signal
+
+	def run(self):
+		statuses = {}
+		for job_id in self.job_ids:
+			try:
+				if self.rescale_api.is_job_completed(job_id):
+					statuses[job_id] = 'Completed'
+				elif self.rescale_api.is_job_executing(job_id):
+					statuses[job_id] = 'Executing'
+			except Exception as e:
+				self.log_signal.emit(f"Error in status polling (Job ID: {job_id}): {e}")
+		self.signals.result.emit(statuses)
+
+
+class LiveTailWorker(QRunnable):
+	def __init__(self, log_tail, log_signal):
+		super().__init__()
+		self.log_tail = log_tail
+		self.signals = WorkerSignals()
+		self.log_signal = log_signal
+
+	def run(self):
+		text, rows = '', []
+		try:
+			text, rows = self.log_tail.poll()
+		except Exception as e:
+			self.log_signal.emit(f"Error in live tail (Job ID: {self.log_tail.job_id}): {e}")
+		finally:
+			self.signals.result.emit((self.log_tail, text, rows, self.log_tail.finished))